@@ -2,67 +2,213 @@ import asyncio
 import logging
 import signal
 import sys
+from typing import TYPE_CHECKING
 
-from infra.utils import circular_container_wire_and_init
+from dependency_injector import providers
+from services.scheduler.replay import read_trace, replay_inputs, trace_start
+from services.scheduler.sources import jsonl_inputs
+
+from infra.instrumentation.monitor import Instrumentation
+from infra.logs import setup_logging
+from infra.temporalio_utils.ids import new_run_id
+from infra.temporalio_utils.settings import parse_env_temporalio_clients
+from infra.utils import (
+    circular_container_wire_and_init,
+    shutdown_container_resources,
+)
 
 from .container import AppContainer
-from .settings import WIRE_MODULES
+from .multiprocess import run_multiprocess
+from .settings import WIRE_MODULES, Settings
+from .targets import TargetReporter, check_namespaces, target_settings
+
+if TYPE_CHECKING:
+    from services.scheduler.service import SchedulerService, StatsCallback
+    from services.scheduler.targets import SchedulerTarget
 
-logging.basicConfig(level=logging.INFO)
 log = logging.getLogger(__name__)
 
 
-async def async_main() -> None:
+async def async_main(
+    settings: Settings | None = None,
+    stats_callback: "StatsCallback | None" = None,
+) -> None:
     container = AppContainer()
+    if settings is not None:
+        container.app_settings.override(providers.Object(settings))
     await circular_container_wire_and_init(container, wire_modules=WIRE_MODULES)
 
     # Get settings and create scheduler service
     settings = container.app_settings()
+    if not settings.scheduler_run_id:
+        # One run ID shared by all targets, workflow IDs and memos refer to it
+        settings = settings.model_copy(update={"scheduler_run_id": new_run_id()})
     log.info(f"Settings: {settings}")
-    scheduler_service = container.scheduler_container.scheduler_service()
-    if asyncio.isfuture(scheduler_service):
-        scheduler_service = await scheduler_service
+    instrumentation = None
+    if settings.instrumentation_enabled:
+        instrumentation = Instrumentation(settings, name="test-sheduler")
+    stage_timings = instrumentation.stage_timings if instrumentation else None
 
-    if settings.scheduler_infinite_mode:
-        log.info("Starting infinite scheduler service demonstration")
-
-        # Setup signal handler for graceful shutdown
-        def signal_handler(signum, frame):
-            log.info(f"Received signal {signum}, stopping scheduler...")
-            scheduler_service._should_stop = True
+    # One scheduler, or one per target of a weighted namespace/queue mix
+    target_reporter = None
+    runs: list[tuple[SchedulerService, Settings]] = []
+    if settings.scheduler_targets:
+        target_reporter = TargetReporter(settings, stats_callback)
+        for index, target in enumerate(settings.scheduler_targets):
+            service_settings = target_settings(settings, index)
+            scheduler_service = container.scheduler_container.scheduler_service(
+                app_settings=service_settings,
+                stats_callback=target_reporter.stats_callback(target.name),
+                stage_timings=stage_timings,
+                name=target.name,
+            )
+            if asyncio.isfuture(scheduler_service):
+                scheduler_service = await scheduler_service
+            runs.append((scheduler_service, service_settings))
+    else:
+        scheduler_service = container.scheduler_container.scheduler_service(
+            app_settings=settings,
+            stats_callback=stats_callback,
+            stage_timings=stage_timings,
+        )
+        if asyncio.isfuture(scheduler_service):
+            scheduler_service = await scheduler_service
+        runs.append((scheduler_service, settings))
+    instrumentation_task = (
+        asyncio.create_task(instrumentation.run()) if instrumentation else None
+    )
+    # Graceful shutdown: stop producing, drain in-flight work up to the drain
+    # timeout, then report (and optionally terminate) what was abandoned
+    loop = asyncio.get_running_loop()
 
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+    def on_signal(signum: signal.Signals) -> None:
+        log.info(f"Received signal {signum.name}, stopping scheduler...")
+        for scheduler_service, _ in runs:
+            scheduler_service.stop()
 
-        try:
-            # Run scheduler infinitely
-            max_runtime = (
-                settings.scheduler_max_runtime
-                if settings.scheduler_max_runtime > 0
-                else None
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, on_signal, signum)
+    try:
+        if settings.scheduler_trace:
+            # One time origin for all targets, records are routed by target,
+            # records without namespace or task queue go to the first target
+            origin = trace_start(settings.scheduler_trace) or 0.0
+            primary = (
+                settings.scheduler_targets[0] if settings.scheduler_targets else None
+            )
+            schedulers = asyncio.gather(
+                *(
+                    _replay_trace(
+                        scheduler_service,
+                        service_settings,
+                        origin,
+                        primary,
+                    )
+                    for scheduler_service, service_settings in runs
+                ),
             )
-            await scheduler_service.run_infinite(
-                message=settings.scheduler_message,
-                count=3,
-                max_runtime=max_runtime,
+        else:
+            schedulers = asyncio.gather(
+                *(
+                    _run_scheduler(scheduler_service, service_settings)
+                    for scheduler_service, service_settings in runs
+                ),
             )
-        except KeyboardInterrupt:
-            log.info("Keyboard interrupt received")
+        if target_reporter is not None:
+            await target_reporter.run(schedulers)
+        else:
+            await schedulers
+    finally:
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(signum)
+        if instrumentation_task is not None:
+            instrumentation_task.cancel()
+        await shutdown_container_resources(container)
+
+    log.info("Demonstration completed")
+
+
+async def _replay_trace(
+    scheduler_service: "SchedulerService",
+    settings: Settings,
+    origin: float,
+    primary: "SchedulerTarget | None",
+) -> None:
+    log.info(
+        f"Replaying trace {settings.scheduler_trace} "
+        f"at {settings.scheduler_trace_speed:g}x speed",
+    )
+    records = read_trace(
+        settings.scheduler_trace,
+        shard_index=settings.scheduler_batch_shard_index,
+        shard_count=settings.scheduler_batch_shard_count,
+    )
+    await scheduler_service.run_infinite(
+        count=settings.scheduler_echo_count,
+        max_runtime=settings.scheduler_max_runtime or None,
+        inputs=replay_inputs(
+            records,
+            start=origin,
+            speed=settings.scheduler_trace_speed,
+            count=settings.scheduler_echo_count,
+            strategy=settings.scheduler_echo_strategy,
+            namespace=settings.scheduler_namespace if primary else None,
+            task_queue=settings.scheduler_task_queue if primary else None,
+            default_target=(primary.namespace, primary.task_queue) if primary else None,
+        ),
+    )
+
+
+async def _run_scheduler(
+    scheduler_service: "SchedulerService",
+    settings: Settings,
+) -> None:
+    if settings.scheduler_infinite_mode:
+        log.info("Starting infinite scheduler service demonstration")
+
+        # Run scheduler infinitely
+        max_runtime = (
+            settings.scheduler_max_runtime
+            if settings.scheduler_max_runtime > 0
+            else None
+        )
+        await scheduler_service.run_infinite(
+            message=settings.scheduler_message,
+            count=settings.scheduler_echo_count,
+            max_runtime=max_runtime,
+        )
     else:
         log.info("Starting batch scheduler service demonstration")
 
-        # Run scheduler for specific number of workflows
+        inputs = None
+        if settings.scheduler_batch_source:
+            inputs = jsonl_inputs(
+                settings.scheduler_batch_source,
+                count=settings.scheduler_echo_count,
+                strategy=settings.scheduler_echo_strategy,
+                shard_index=settings.scheduler_batch_shard_index,
+                shard_count=settings.scheduler_batch_shard_count,
+            )
+
+        # Run scheduler for specific number of workflows or the whole source
         await scheduler_service.run(
             total_workflows=settings.scheduler_total_workflows,
             message=settings.scheduler_message,
+            inputs=inputs,
+            count=settings.scheduler_echo_count,
         )
 
-    log.info("Demonstration completed")
-
 
 def main() -> None:
     try:
-        asyncio.run(async_main())
+        settings = Settings()
+        setup_logging(settings)
+        # Before any process starts or connects
+        check_namespaces(settings, parse_env_temporalio_clients())
+        if settings.scheduler_processes > 1:
+            run_multiprocess(settings)
+        else:
+            asyncio.run(async_main(settings))
     except KeyboardInterrupt:
         log.info("Application interrupted")
         sys.exit(0)
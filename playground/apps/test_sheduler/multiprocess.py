@@ -0,0 +1,188 @@
+"""Fan-out of the scheduler to several load generator processes
+
+Each child process runs its own SchedulerService and Temporal client
+connection with its share of concurrency, target rate and total workflows.
+Children send their stats snapshots over a multiprocessing queue and the
+parent prints one combined report.
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import time
+from typing import TYPE_CHECKING
+
+from services.scheduler.container import get_rate_profile
+from services.scheduler.service import SchedulerService
+from services.scheduler.sources import STDIN_SOURCE
+from services.scheduler.stats import SchedulerStats, StatsAggregator, StatsReporter
+
+from infra.logs import setup_logging
+from infra.temporalio_utils.ids import new_run_id
+from infra.temporalio_utils.settings import TemporalioRuntimeSettings
+from infra.utils import offset_bind_address
+
+if TYPE_CHECKING:
+    from multiprocessing.process import BaseProcess
+
+    from .settings import Settings
+
+log = logging.getLogger(__name__)
+
+# How often the parent checks children liveness while waiting for stats
+_POLL_INTERVAL = 1.0
+
+
+def _share(total: int, processes: int, index: int) -> int:
+    """Split an integer budget so that shares differ by at most one"""
+    return total // processes + (1 if index < total % processes else 0)
+
+
+def child_settings(settings: "Settings", processes: int, index: int) -> "Settings":
+    """Settings of one child process with its share of the load"""
+    return settings.model_copy(
+        update={
+            "scheduler_processes": 1,
+            "scheduler_concurrency": max(
+                1,
+                _share(settings.scheduler_concurrency, processes, index),
+            ),
+            "scheduler_total_workflows": _share(
+                settings.scheduler_total_workflows,
+                processes,
+                index,
+            ),
+            "scheduler_stream_pool_size": max(
+                1,
+                _share(settings.scheduler_stream_pool_size, processes, index),
+            ),
+            "scheduler_targets": [
+                target.model_copy(
+                    update={
+                        "concurrency": target.concurrency
+                        and max(1, _share(target.concurrency, processes, index)),
+                    },
+                )
+                for target in settings.scheduler_targets
+            ],
+            "scheduler_message": f"{settings.scheduler_message} [p{index}]",
+            "scheduler_batch_shard_index": index,
+            "scheduler_batch_shard_count": processes,
+            "scheduler_rate": settings.scheduler_rate / processes,
+            "scheduler_rate_max": settings.scheduler_rate_max / processes,
+            "scheduler_rate_step": settings.scheduler_rate_step / processes,
+            "scheduler_rate_burst": max(1, settings.scheduler_rate_burst // processes),
+        },
+    )
+
+
+def _child_main(
+    settings: "Settings",
+    index: int,
+    stats_queue: "multiprocessing.Queue[tuple[int, SchedulerStats]]",
+) -> None:
+    import asyncio
+
+    from .main import async_main
+
+    # Every process binds its own Prometheus port
+    base_address = TemporalioRuntimeSettings().temporal_metrics_bind_address
+    os.environ["TEMPORAL_METRICS_BIND_ADDRESS"] = offset_bind_address(
+        base_address,
+        index,
+    )
+    setup_logging(settings)
+    # Interval reports are printed by the parent only
+    logging.getLogger(SchedulerService.__module__).setLevel(logging.WARNING)
+
+    def stats_callback(stats: SchedulerStats) -> None:
+        stats_queue.put((index, stats))
+
+    try:
+        asyncio.run(async_main(settings, stats_callback=stats_callback))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_multiprocess(settings: "Settings") -> None:
+    processes_count = settings.scheduler_processes
+    if settings.scheduler_batch_source == STDIN_SOURCE:
+        msg = "Batch source from stdin is not supported with several processes"
+        raise ValueError(msg)
+    if not settings.scheduler_run_id:
+        # Generated before the fan-out so all children share it
+        settings = settings.model_copy(update={"scheduler_run_id": new_run_id()})
+    ctx = multiprocessing.get_context("spawn")
+    stats_queue: multiprocessing.Queue[tuple[int, SchedulerStats]] = ctx.Queue()
+    processes: list[BaseProcess] = [
+        ctx.Process(
+            target=_child_main,
+            args=(child_settings(settings, processes_count, index), index, stats_queue),
+            name=f"test-sheduler-{index}",
+        )
+        for index in range(processes_count)
+    ]
+
+    log.info(f"Starting {processes_count} scheduler processes")
+    start_time = time.time()
+    for process in processes:
+        process.start()
+
+    def signal_handler(signum, frame):
+        log.info(f"Received signal {signum}, stopping scheduler processes...")
+        for process in processes:
+            if process.is_alive() and process.pid is not None:
+                os.kill(process.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    aggregator = StatsAggregator()
+    reporter = StatsReporter(open_loop=get_rate_profile(settings) is not None)
+    report_interval = settings.scheduler_report_interval
+    next_report = time.monotonic() + report_interval
+
+    while any(process.is_alive() for process in processes):
+        timeout = min(_POLL_INTERVAL, max(0.0, next_report - time.monotonic()))
+        try:
+            index, stats = stats_queue.get(timeout=timeout)
+            aggregator.add(index, stats)
+        except queue.Empty:
+            pass
+        if time.monotonic() >= next_report:
+            if aggregator.updated:
+                for line in reporter.interval_report(aggregator.take()):
+                    log.info(f"[all processes] {line}")
+            next_report += report_interval
+
+    # Final snapshots may still be in flight after the children exited
+    while True:
+        try:
+            index, stats = stats_queue.get(timeout=_POLL_INTERVAL)
+            aggregator.add(index, stats)
+        except queue.Empty:
+            break
+    for process in processes:
+        process.join()
+
+    total = aggregator.take()
+    total_time = time.time() - start_time
+    final_rate = total.started / total_time if total_time > 0 else 0
+    log.info(
+        f"[all processes] Scheduler stopped. Processes: {processes_count}, "
+        f"Total workflows: {total.started}, Completed: {total.completed}, "
+        f"Failed: {total.failed}, Runtime (incl. startup): {total_time:.2f}s, "
+        f"Average rate: {final_rate:.2f} wf/s, Missed slots: {total.missed}",
+    )
+    for line in reporter.total_report(total):
+        log.info(f"[all processes] {line}")
+    if total.abandoned:
+        log.warning(
+            f"[all processes] Abandoned on shutdown: {total.abandoned}, "
+            f"terminated workflows: {total.terminated}",
+        )
+    exit_codes = [process.exitcode for process in processes]
+    if any(exit_codes):
+        log.warning(f"Scheduler process exit codes: {exit_codes}")
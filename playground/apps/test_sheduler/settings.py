@@ -1,20 +1,107 @@
+from typing import Literal
+
 from dotenv import load_dotenv
-from pydantic_settings import BaseSettings
+from pydantic import Field, model_validator
+from services.scheduler.targets import SchedulerTarget
+from tasks.shared import EchoStrategy
+
+from infra.instrumentation.settings import InstrumentationSettings
+from infra.logs import LoggingSettings
+from infra.temporalio_utils.ids import WorkflowIdScheme
 
 load_dotenv()
 
 WIRE_MODULES: list[str] = []
 
 
-class Settings(BaseSettings):
+class Settings(InstrumentationSettings, LoggingSettings):
     # Scheduler settings
     scheduler_task_queue: str = "benchmark"
     scheduler_namespace: str = "default"
     scheduler_concurrency: int = 10
     scheduler_total_workflows: int = 100
     scheduler_message: str = "Test scheduler"
+    # EchoWorkflow input: echoes per workflow and how they are executed,
+    # "sequential", "parallel", "local" (local activities) or "batched"
+    scheduler_echo_count: int = Field(default=3, ge=0)
+    scheduler_echo_strategy: EchoStrategy = "sequential"
+    # >1 fans out to N load generator processes sharing concurrency/rate/total
+    scheduler_processes: int = Field(default=1, ge=1)
+    # "execute" waits for workflow completion inside a concurrency slot,
+    # "start" only holds a slot for the start RPC (fire-and-forget),
+    # "signal" sends messages to a pool of long-running EchoStreamWorkflows,
+    # "update" echoes request-response through updates of the same pool
+    scheduler_start_mode: Literal["execute", "start", "signal", "update"] = "execute"
+    # In "start" mode: await workflow results outside the slots for e2e latency
+    scheduler_track_completion: bool = False
+    # "update" mode: update-with-start for every message instead of only the
+    # first one per stream workflow
+    scheduler_update_with_start: bool = False
+    # "signal"/"update" modes: stream workflows and continue-as-new thresholds
+    scheduler_stream_pool_size: int = Field(default=10, ge=1)
+    scheduler_stream_max_history_length: int = Field(default=10_000, ge=1)
+    scheduler_stream_max_history_size: int = Field(default=10 * 1024 * 1024, ge=1)
+    # Batch mode inputs: "" = synthetic numbered messages, "-" = JSONL from stdin,
+    # otherwise a JSONL file path (scheduler_total_workflows is then ignored)
+    scheduler_batch_source: str = ""
+    # Set for child processes to split the batch source between them
+    scheduler_batch_shard_index: int = Field(default=0, ge=0)
+    scheduler_batch_shard_count: int = Field(default=1, ge=1)
+    # Weighted namespace/task queue mix as JSON, e.g. [{"namespace": "ns1",
+    # "task_queue": "a", "weight": 70}, {"namespace": "ns2", "task_queue": "b",
+    # "weight": 30, "concurrency": 20}]; empty = scheduler_namespace/task_queue
+    scheduler_targets: list[SchedulerTarget] = Field(default_factory=list)
 
     # Infinite mode settings
     scheduler_infinite_mode: bool = False
     scheduler_report_interval: int = 10  # seconds
     scheduler_max_runtime: int = 0  # 0 = infinite, >0 = max seconds to run
+
+    # Trace replay (services/scheduler/replay.py): JSONL trace of timestamped
+    # starts replayed open-loop at the original inter-arrival times divided by
+    # the speed, instead of the batch/infinite inputs; with scheduler_targets
+    # records are routed by namespace/task_queue, max_runtime still applies
+    scheduler_trace: str = ""
+    scheduler_trace_speed: float = Field(default=1, gt=0)
+
+    # Shutdown (SIGINT/SIGTERM, max runtime): seconds in-flight starts and
+    # awaited workflows may take before they are abandoned and reported
+    scheduler_drain_timeout: float = Field(default=30, ge=0)
+    # Terminate workflows whose result was still awaited at the drain deadline
+    scheduler_terminate_abandoned: bool = False
+
+    # Workflow IDs (infra/temporalio_utils/ids.py): "sequential" =
+    # echo-workflow-{run_id}-{index}, "uuid7", "uuid4", or "deterministic" =
+    # sequential with the given run ID and REJECT_DUPLICATE, a retried run
+    # skips the starts that already succeeded
+    scheduler_workflow_id_scheme: WorkflowIdScheme = "sequential"
+    # Run ID shared by all processes/targets, empty = generated per run
+    scheduler_run_id: str = ""
+    # Attach the run ID as memo {"run_id": ...} to every started workflow
+    scheduler_run_id_memo: bool = True
+    # Registered keyword search attribute set to the run ID, empty = none
+    scheduler_run_id_search_attribute: str = ""
+
+    # Open-loop rate control, a profile that never leaves rate 0 keeps the
+    # closed loop mode (step/ramp/spike may start from scheduler_rate = 0)
+    scheduler_rate: float = Field(default=0, ge=0)  # target workflows per second
+    scheduler_rate_profile: Literal["constant", "step", "ramp", "spike"] = "constant"
+    scheduler_rate_max: float = Field(default=0, ge=0)  # peak rate for step/ramp/spike
+    scheduler_rate_step: float = 0  # step: rate increment
+    scheduler_rate_step_interval: float = Field(default=60, gt=0)  # step: seconds
+    scheduler_rate_ramp_duration: float = Field(default=60, ge=0)  # ramp: seconds
+    scheduler_rate_spike_start: float = Field(default=30, ge=0)  # spike: seconds
+    scheduler_rate_spike_duration: float = Field(default=10, ge=0)  # spike: seconds
+    scheduler_rate_spike_period: float = Field(default=0, ge=0)  # 0 = single spike
+    scheduler_rate_burst: int = Field(default=100, ge=1)  # max catch-up slots after lag
+
+    @model_validator(mode="after")
+    def _validate_run_id(self) -> "Settings":
+        if (
+            self.scheduler_workflow_id_scheme == "deterministic"
+            and not self.scheduler_run_id
+        ):
+            raise ValueError(
+                "scheduler_run_id is required by the deterministic workflow ID scheme",
+            )
+        return self
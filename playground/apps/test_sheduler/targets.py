@@ -0,0 +1,121 @@
+"""Fan-out of the scheduler to weighted namespace / task queue targets
+
+Each target runs its own SchedulerService in this process with its share of
+the load (see services/scheduler/targets.py) and reports under its name. The
+snapshots of all targets are combined into one report prefixed with
+`[all targets]`, and forwarded to the outer stats callback (multi-process
+parent) as one scheduler.
+"""
+
+import asyncio
+import functools
+import logging
+from collections.abc import Awaitable, Collection
+from typing import TYPE_CHECKING
+
+from services.scheduler.container import get_rate_profile
+from services.scheduler.service import StatsCallback
+from services.scheduler.stats import SchedulerStats, StatsAggregator, StatsReporter
+from services.scheduler.targets import weighted_shares
+
+if TYPE_CHECKING:
+    from .settings import Settings
+
+log = logging.getLogger(__name__)
+
+
+def check_namespaces(settings: "Settings", namespaces: Collection[str]) -> None:
+    """Fail fast when a target (or the namespace) has no configured client"""
+    required = {target.namespace for target in settings.scheduler_targets} or {
+        settings.scheduler_namespace,
+    }
+    missing = sorted(required - set(namespaces))
+    if missing:
+        msg = (
+            f"No Temporal client for namespaces {missing}, configured: "
+            f"{sorted(namespaces)}. Set <PREFIX>_TEMPORAL_URL and "
+            f"<PREFIX>_TEMPORAL_NAMESPACE for each of them"
+        )
+        raise ValueError(msg)
+
+
+def target_settings(settings: "Settings", index: int) -> "Settings":
+    """Settings of the `index`-th target with its share of the load"""
+    targets = settings.scheduler_targets
+    if settings.scheduler_batch_source:
+        msg = "Batch source is not supported with several targets"
+        raise ValueError(msg)
+    target = targets[index]
+    weights = [target.weight for target in targets]
+    fraction = target.weight / sum(weights)
+    return settings.model_copy(
+        update={
+            "scheduler_targets": [],
+            "scheduler_namespace": target.namespace,
+            "scheduler_task_queue": target.task_queue,
+            "scheduler_concurrency": target.concurrency
+            or max(1, round(settings.scheduler_concurrency * fraction)),
+            "scheduler_total_workflows": weighted_shares(
+                settings.scheduler_total_workflows,
+                weights,
+            )[index],
+            "scheduler_stream_pool_size": max(
+                1,
+                round(settings.scheduler_stream_pool_size * fraction),
+            ),
+            "scheduler_rate": settings.scheduler_rate * fraction,
+            "scheduler_rate_max": settings.scheduler_rate_max * fraction,
+            "scheduler_rate_step": settings.scheduler_rate_step * fraction,
+            "scheduler_rate_burst": max(
+                1,
+                round(settings.scheduler_rate_burst * fraction),
+            ),
+        },
+    )
+
+
+class TargetReporter:
+    """Combined interval and total reports of the target schedulers"""
+
+    def __init__(
+        self,
+        settings: "Settings",
+        stats_callback: StatsCallback | None = None,
+    ) -> None:
+        self._report_interval = settings.scheduler_report_interval
+        self._stats_callback = stats_callback
+        self._aggregator = StatsAggregator()
+        self._reporter = StatsReporter(open_loop=get_rate_profile(settings) is not None)
+
+    def stats_callback(self, name: str) -> StatsCallback:
+        """Stats callback of the target scheduler `name`"""
+        return functools.partial(self._aggregator.add, name)
+
+    def _take(self) -> SchedulerStats:
+        stats = self._aggregator.take()
+        if self._stats_callback is not None:
+            self._stats_callback(stats)
+        return stats
+
+    async def _report_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._report_interval)
+            if self._aggregator.updated:
+                for line in self._reporter.interval_report(self._take()):
+                    log.info(f"[all targets] {line}")
+
+    async def run(self, schedulers: Awaitable[object]) -> None:
+        """Report until `schedulers` (all target runs) complete"""
+        report_task = asyncio.create_task(self._report_loop())
+        try:
+            await schedulers
+        finally:
+            report_task.cancel()
+        total = self._take()
+        log.info(
+            f"[all targets] Scheduler stopped. Total workflows: {total.started}, "
+            f"Completed: {total.completed}, Failed: {total.failed}, "
+            f"Abandoned: {total.abandoned}",
+        )
+        for line in self._reporter.total_report(total):
+            log.info(f"[all targets] {line}")
@@ -2,8 +2,8 @@ from dependency_injector import providers
 from dependency_injector.containers import (  # pylint: disable=no-name-in-module
     DeclarativeContainer,
 )
-from tasks.activities import echo
-from tasks.workflows import EchoWorkflow
+from tasks.activities import echo, echo_batch
+from tasks.workflows import EchoStreamWorkflow, EchoWorkflow
 from temporalio.client import Client
 from temporalio.worker import Worker
 
@@ -16,11 +16,17 @@ def get_temporal_worker(
     app_settings: Settings,
     temporal_clients: dict[str, Client],
 ) -> Worker:
+    client = temporal_clients[app_settings.temporal_worker_namespace]
+    if client.service_client.config.lazy:
+        raise ValueError(
+            f"Worker namespace {app_settings.temporal_worker_namespace} "
+            "can't use a lazy client, disable TEMPORAL_LAZY_CONNECT for it",
+        )
     return Worker(
         task_queue=app_settings.temporal_worker_task_queue,
-        client=temporal_clients[app_settings.temporal_worker_namespace],
-        workflows=[EchoWorkflow],
-        activities=[echo],
+        client=client,
+        workflows=[EchoWorkflow, EchoStreamWorkflow],
+        activities=[echo, echo_batch],
         **app_settings.temporal_worker_settings(),
     )
 
@@ -1,10 +1,19 @@
 import asyncio
 import logging
+import signal
 
-from infra.utils import circular_container_wire_and_init
+from infra.instrumentation.monitor import Instrumentation
+from infra.logs import setup_logging
+from infra.temporalio_utils.container import get_metric_buffer
+from infra.temporalio_utils.metrics import WorkerMetricsCollector
+from infra.utils import (
+    circular_container_wire_and_init,
+    shutdown_container_resources,
+)
 
 from .container import AppContainer
-from .settings import WIRE_MODULES
+from .settings import WIRE_MODULES, Settings
+from .supervisor import run_supervisor
 
 log = logging.getLogger(__name__)
 
@@ -15,8 +24,49 @@ async def async_main() -> None:
     worker = container.temporal_worker()  # type: ignore
     if asyncio.isfuture(worker):
         worker = await worker
-    await worker.run()
+
+    # Drain gracefully on SIGTERM/SIGINT: stop polling, let running tasks finish
+    shutdown_tasks: list[asyncio.Task[None]] = []
+
+    def signal_handler(signum: int) -> None:
+        log.warning(f"Received signal {signum}, draining worker...")
+        shutdown_tasks.append(asyncio.create_task(worker.shutdown()))
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, signal_handler, signum)
+
+    settings = container.app_settings()
+    # Sticky cache, replay and activity queue stats from the metric buffer
+    background_tasks: list[asyncio.Task[None]] = []
+    metric_buffer = get_metric_buffer()
+    if metric_buffer is not None:
+        background_tasks.append(
+            asyncio.create_task(
+                WorkerMetricsCollector(metric_buffer).run(
+                    settings.temporal_worker_metrics_log_interval,
+                ),
+            ),
+        )
+    # Event loop lag, task counts and profile snapshots of this process
+    if settings.instrumentation_enabled:
+        background_tasks.append(
+            asyncio.create_task(
+                Instrumentation(settings, name="test-worker").run(),
+            ),
+        )
+    try:
+        await worker.run()
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        await shutdown_container_resources(container)
 
 
 def main() -> None:
-    asyncio.run(async_main())
+    settings = Settings()  # type: ignore
+    setup_logging(settings)
+    if settings.temporal_worker_processes > 1:
+        run_supervisor(settings)
+    else:
+        asyncio.run(async_main())
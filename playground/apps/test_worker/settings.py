@@ -1,5 +1,8 @@
 from dotenv import load_dotenv
+from pydantic import Field
 
+from infra.instrumentation.settings import InstrumentationSettings
+from infra.logs import LoggingSettings
 from infra.temporalio_utils.settings import TemporalioWorkerSettings
 
 load_dotenv()
@@ -7,5 +10,16 @@ load_dotenv()
 WIRE_MODULES: list[str] = []
 
 
-class Settings(TemporalioWorkerSettings):
-    pass
+class Settings(TemporalioWorkerSettings, InstrumentationSettings, LoggingSettings):
+    # >1 runs a supervisor with N worker processes on the same task queue
+    temporal_worker_processes: int = Field(default=1, ge=1, examples=[4])
+    # Pin worker process i to CPU i % cpu_count (Linux only)
+    temporal_worker_cpu_affinity: bool = Field(default=False, examples=[True])
+    # Children exiting with a non-zero code are restarted after the delay,
+    # doubled per restart within the window up to the max delay. A child
+    # restarted max_restarts times within the window is given up.
+    temporal_worker_restart_on_crash: bool = Field(default=True, examples=[True])
+    temporal_worker_restart_delay: float = Field(default=1.0, ge=0, examples=[1.0])
+    temporal_worker_restart_max_delay: float = Field(default=60, ge=0, examples=[60])
+    temporal_worker_max_restarts: int = Field(default=5, ge=0, examples=[5])
+    temporal_worker_restart_window: float = Field(default=300, gt=0, examples=[300])
@@ -0,0 +1,180 @@
+"""Supervisor that runs several worker processes on the same task queue
+
+Every child has its own client, SDK runtime and Prometheus port, so workflow
+task processing is not limited by a single GIL. SIGTERM/SIGINT are forwarded
+to the children, which drain gracefully; crashed children are restarted with
+exponential backoff until they crash too often.
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from typing import TYPE_CHECKING
+
+from infra.logs import LoggingSettings, setup_logging
+from infra.temporalio_utils.settings import TemporalioRuntimeSettings
+from infra.utils import offset_bind_address
+
+if TYPE_CHECKING:
+    from multiprocessing.process import BaseProcess
+
+    from .settings import Settings
+
+log = logging.getLogger(__name__)
+
+# Extra seconds on top of the graceful shutdown timeout before children are killed
+_KILL_MARGIN = 10.0
+# Longest wait for child exits, so a pending restart notices a shutdown signal
+_POLL_INTERVAL = 1.0
+
+
+def _child_main(index: int, cpu_affinity: bool) -> None:
+    import asyncio
+
+    from .main import async_main
+
+    setup_logging(LoggingSettings())
+    # Every process binds its own Prometheus port
+    base_address = TemporalioRuntimeSettings().temporal_metrics_bind_address
+    os.environ["TEMPORAL_METRICS_BIND_ADDRESS"] = offset_bind_address(
+        base_address,
+        index,
+    )
+    if cpu_affinity and hasattr(os, "sched_setaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+        cpu = cpus[index % len(cpus)]
+        os.sched_setaffinity(0, {cpu})
+        log.info(f"Worker process {index} pinned to CPU {cpu}")
+
+    asyncio.run(async_main())
+
+
+class WorkerSupervisor:
+    def __init__(self, settings: "Settings") -> None:
+        self._settings = settings
+        self._ctx = multiprocessing.get_context("spawn")
+        self._processes: dict[int, BaseProcess] = {}
+        self._stopping = False
+        # Monotonic times of recent restarts and the pending restart by child
+        self._restarts: dict[int, deque[float]] = {}
+        self._restart_at: dict[int, float] = {}
+        self._given_up = False
+
+    def _start(self, index: int) -> None:
+        process = self._ctx.Process(
+            target=_child_main,
+            args=(index, self._settings.temporal_worker_cpu_affinity),
+            name=f"test-worker-{index}",
+        )
+        process.start()
+        self._processes[index] = process
+        log.info(f"Started worker process {index} (pid {process.pid})")
+
+    def _signal_handler(self, signum, frame) -> None:
+        log.info(f"Received signal {signum}, draining worker processes...")
+        self._stop_children()
+
+    def _stop_children(self) -> None:
+        self._stopping = True
+        self._restart_at.clear()
+        for process in self._processes.values():
+            if process.is_alive() and process.pid is not None:
+                os.kill(process.pid, signal.SIGTERM)
+
+    def _on_exit(self, index: int, exitcode: int | None) -> None:
+        """Schedule the restart of a crashed child
+
+        A crash loop (too many restarts within the window) drains the other
+        children and ends the supervisor.
+        """
+        if exitcode == 0:
+            log.info(f"Worker process {index} exited cleanly, not restarted")
+            return
+        log.warning(f"Worker process {index} exited with code {exitcode}")
+        if not self._settings.temporal_worker_restart_on_crash:
+            return
+        now = time.monotonic()
+        restarts = self._restarts.setdefault(index, deque())
+        while (
+            restarts
+            and restarts[0] <= now - self._settings.temporal_worker_restart_window
+        ):
+            restarts.popleft()
+        if len(restarts) >= self._settings.temporal_worker_max_restarts:
+            log.error(
+                f"Worker process {index} restarted {len(restarts)} times within "
+                f"{self._settings.temporal_worker_restart_window:g}s, giving up",
+            )
+            self._given_up = True
+            self._stop_children()
+            return
+        delay = min(
+            self._settings.temporal_worker_restart_delay * 2 ** len(restarts),
+            self._settings.temporal_worker_restart_max_delay,
+        )
+        restarts.append(now + delay)
+        self._restart_at[index] = now + delay
+        log.info(f"Restarting worker process {index} in {delay:.1f}s")
+
+    def _join_all(self) -> None:
+        deadline = (
+            time.monotonic()
+            + self._settings.temporal_worker_graceful_shutdown_timeout
+            + _KILL_MARGIN
+        )
+        for index, process in self._processes.items():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                log.warning(f"Worker process {index} did not drain in time, killing")
+                process.kill()
+                process.join()
+
+    def run(self) -> bool:
+        """Supervise the children until a signal or all of them exited
+
+        Returns False when a crash-looping child ended the supervisor.
+        """
+        signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGTERM, self._signal_handler)
+
+        for index in range(self._settings.temporal_worker_processes):
+            self._start(index)
+
+        while not self._stopping:
+            now = time.monotonic()
+            for index, restart_at in list(self._restart_at.items()):
+                if restart_at <= now:
+                    del self._restart_at[index]
+                    self._start(index)
+            sentinels = {
+                process.sentinel: index
+                for index, process in self._processes.items()
+                if process.is_alive()
+            }
+            if not sentinels and not self._restart_at:
+                break
+            timeout = None
+            if self._restart_at:
+                next_restart = min(self._restart_at.values())
+                timeout = min(max(next_restart - now, 0), _POLL_INTERVAL)
+            for sentinel in wait(list(sentinels), timeout):
+                index = sentinels[sentinel]  # type: ignore
+                process = self._processes[index]
+                process.join()
+                if not self._stopping:
+                    self._on_exit(index, process.exitcode)
+
+        self._join_all()
+        log.info("All worker processes stopped")
+        return not self._given_up
+
+
+def run_supervisor(settings: "Settings") -> None:
+    if not WorkerSupervisor(settings).run():
+        # A non-zero exit lets the orchestrator restart or alert on the pod
+        sys.exit(1)
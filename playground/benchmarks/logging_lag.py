@@ -0,0 +1,81 @@
+"""Benchmark of event loop lag caused by per-item logging
+
+Coroutines log one per-item message per simulated activity, like the echo
+activity, through each logging setup of infra/logs.py while LoopLagMonitor
+samples the loop. Records go to a sink that blocks for WRITE_LATENCY per
+flushed record, like stderr on a busy pipe or container log driver:
+
+    python -m playground.benchmarks.logging_lag
+"""
+
+import asyncio
+import io
+import logging
+import time
+
+from infra.instrumentation.monitor import LoopLagMonitor
+from infra.logs import PER_ITEM, LoggingSettings, setup_logging, stop_listener
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+log = logging.getLogger(__name__)
+bench_log = logging.getLogger("benchmarks.logging_lag.items")
+
+TASKS = 100
+MESSAGES_PER_TASK = 2000
+MESSAGE = "x" * 200
+# Seconds a flush of the sink blocks, the GIL is released meanwhile
+WRITE_LATENCY = 0.00005
+
+SETUPS = {
+    "sync": LoggingSettings(),
+    "async": LoggingSettings(log_async=True),
+    "async-sample-1%": LoggingSettings(log_async=True, log_sample_rate=0.01),
+    "async-limit-1000/s": LoggingSettings(log_async=True, log_rate_limit=1000),
+}
+
+
+class _BlockingSink(io.StringIO):
+    def flush(self) -> None:
+        time.sleep(WRITE_LATENCY)
+        # Keep memory flat, the content is not needed
+        self.seek(0)
+        self.truncate()
+
+
+async def _produce() -> None:
+    for index in range(MESSAGES_PER_TASK):
+        bench_log.info("Echoing %s #%d", MESSAGE, index, extra=PER_ITEM)
+        # One activity per iteration, yields to the loop like awaiting a task
+        await asyncio.sleep(0)
+
+
+async def _measure(settings: LoggingSettings) -> tuple[float, float, float]:
+    """Returns messages per second, mean and max loop lag in milliseconds"""
+    with _BlockingSink() as sink:
+        setup_logging(settings, stream=sink)
+        monitor = LoopLagMonitor(interval=0.01)
+        monitor.start()
+        started = time.perf_counter()
+        await asyncio.gather(*(_produce() for _ in range(TASKS)))
+        elapsed = time.perf_counter() - started
+        mean_lag, max_lag = monitor.pop_interval()
+        monitor.stop()
+        # Queued records are written before the next setup
+        stop_listener()
+    return TASKS * MESSAGES_PER_TASK / elapsed, mean_lag * 1000, max_lag * 1000
+
+
+async def async_main() -> None:
+    results = {name: await _measure(settings) for name, settings in SETUPS.items()}
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+    log.info(f"{'setup':<20} {'msg/s':>10} {'lag mean ms':>12} {'lag max ms':>11}")
+    for name, (rate, mean_lag, max_lag) in results.items():
+        log.info(f"{name:<20} {rate:>10.0f} {mean_lag:>12.2f} {max_lag:>11.2f}")
+
+
+def main() -> None:
+    asyncio.run(async_main())
+
+
+if __name__ == "__main__":
+    main()
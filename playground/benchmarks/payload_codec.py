@@ -0,0 +1,129 @@
+"""Benchmark of payload size against throughput of the compression codec
+
+Encodes and decodes EchoWorkflowInput with messages of growing size through
+the data converter, with and without compression, to choose
+TEMPORAL_COMPRESSION_THRESHOLD from data:
+
+    python -m playground.benchmarks.payload_codec
+"""
+
+import asyncio
+import dataclasses
+import logging
+import random
+import time
+
+from tasks.shared import EchoWorkflowInput
+from temporalio.contrib.pydantic import pydantic_data_converter
+from temporalio.converter import DataConverter
+
+from infra.temporalio_utils.codec import (
+    CompressionAlgorithm,
+    CompressionCodec,
+    zstandard,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+log = logging.getLogger(__name__)
+
+MESSAGE_SIZES = [64, 256, 1024, 4096, 16384, 65536, 262144]
+# Bytes converted per measurement, keeps the runtime similar for all sizes
+BYTES_PER_RUN = 8 * 1024 * 1024
+MIN_ITERATIONS = 200
+
+_WORDS = [
+    "temporal",
+    "workflow",
+    "activity",
+    "scheduler",
+    "worker",
+    "payload",
+    "echo",
+    "history",
+    "namespace",
+    "queue",
+]
+
+
+def _message(size: int) -> str:
+    # Word salad compresses roughly like real text payloads, unlike one
+    # repeated character or random bytes
+    rng = random.Random(size)
+    words: list[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(_WORDS) + str(rng.randrange(1000))
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def _converters() -> dict[str, DataConverter]:
+    converters = {"none": pydantic_data_converter}
+    levels: list[tuple[CompressionAlgorithm, int]] = [("zlib", 1), ("zlib", 6)]
+    if zstandard is not None:
+        levels += [("zstd", 1), ("zstd", 3)]
+    for algorithm, level in levels:
+        converters[f"{algorithm}-{level}"] = dataclasses.replace(
+            pydantic_data_converter,
+            payload_codec=CompressionCodec(
+                algorithm=algorithm,
+                threshold=0,
+                level=level,
+            ),
+        )
+    return converters
+
+
+async def _measure(
+    data_converter: DataConverter,
+    value: EchoWorkflowInput,
+    iterations: int,
+) -> tuple[int, float, float]:
+    """Returns payload size, encode and decode microseconds per payload"""
+    payloads = await data_converter.encode([value])
+    decoded = await data_converter.decode(payloads, [EchoWorkflowInput])
+    assert decoded[0] == value
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await data_converter.encode([value])
+    encode = (time.perf_counter() - started) / iterations * 1_000_000
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await data_converter.decode(payloads, [EchoWorkflowInput])
+    decode = (time.perf_counter() - started) / iterations * 1_000_000
+    return payloads[0].ByteSize(), encode, decode
+
+
+async def async_main() -> None:
+    converters = _converters()
+    log.info(
+        f"{'message B':>10} {'codec':<7} {'payload B':>10} {'ratio':>6} "
+        f"{'encode us':>10} {'decode us':>10} {'encode MB/s':>12}",
+    )
+    for size in MESSAGE_SIZES:
+        value = EchoWorkflowInput(message=_message(size), count=1)
+        iterations = max(MIN_ITERATIONS, BYTES_PER_RUN // size)
+        plain_size = 0
+        for name, data_converter in converters.items():
+            payload_size, encode, decode = await _measure(
+                data_converter,
+                value,
+                iterations,
+            )
+            plain_size = plain_size or payload_size
+            log.info(
+                f"{size:>10} {name:<7} {payload_size:>10} "
+                f"{payload_size / plain_size:>6.2f} {encode:>10.1f} {decode:>10.1f} "
+                f"{size / encode:>12.1f}",
+            )
+
+
+def main() -> None:
+    asyncio.run(async_main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Micro-benchmark of the payload converters for the echo task inputs
+
+Compares payload size and encode/decode time per payload of the default
+pydantic JSON converter and the struct converter from tasks/converter.py:
+
+    python -m playground.benchmarks.payload_converter
+"""
+
+import functools
+import logging
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import BaseModel
+from tasks.converter import EchoPayloadConverter
+from tasks.shared import EchoActivityInput, EchoWorkflowInput
+from temporalio.contrib.pydantic import PydanticPayloadConverter
+from temporalio.converter import PayloadConverter
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+log = logging.getLogger(__name__)
+
+ITERATIONS = 20_000
+REPEAT = 5
+
+CONVERTERS: dict[str, PayloadConverter] = {
+    "pydantic": PydanticPayloadConverter(),
+    "struct": EchoPayloadConverter(),
+}
+VALUES: dict[str, BaseModel] = {
+    "EchoWorkflowInput": EchoWorkflowInput(message="Test scheduler #12345", count=3),
+    "EchoActivityInput": EchoActivityInput(message="Test scheduler #12345"),
+}
+
+
+def _microseconds_per_call(func: Callable[[], Any]) -> float:
+    best = min(timeit.repeat(func, number=ITERATIONS, repeat=REPEAT))
+    return best / ITERATIONS * 1_000_000
+
+
+def main() -> None:
+    log.info(
+        f"{'model':<18} {'converter':<10} {'data B':>7} {'payload B':>10} "
+        f"{'encode us':>10} {'decode us':>10}",
+    )
+    for value_name, value in VALUES.items():
+        value_type = type(value)
+        for converter_name, converter in CONVERTERS.items():
+            payload = converter.to_payloads([value])[0]
+            decoded = converter.from_payloads([payload], [value_type])[0]
+            assert decoded == value, (converter_name, decoded)
+            encode = _microseconds_per_call(
+                functools.partial(converter.to_payloads, [value]),
+            )
+            decode = _microseconds_per_call(
+                functools.partial(converter.from_payloads, [payload], [value_type]),
+            )
+            log.info(
+                f"{value_name:<18} {converter_name:<10} {len(payload.data):>7} "
+                f"{payload.ByteSize():>10} {encode:>10.2f} {decode:>10.2f}",
+            )
+
+
+if __name__ == "__main__":
+    main()
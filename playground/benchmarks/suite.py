@@ -0,0 +1,283 @@
+"""End-to-end benchmark of the scheduler and worker on a local Temporal server
+
+Runs an in-process worker and SchedulerService against the Temporal dev
+server of `temporalio.testing.WorkflowEnvironment` (or an existing server with
+--target), sweeping concurrency, message size and echo count. Every case gets
+its own task queue. Results are written as JSON and can be compared against a
+previous result file to catch regressions:
+
+    python -m playground.benchmarks.suite --output baseline.json
+    python -m playground.benchmarks.suite --baseline baseline.json
+
+The dev server binary is downloaded on first use, pass --dev-server-path to
+run without network access.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import platform
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+from services.scheduler.service import SchedulerService, StartMode
+from services.scheduler.sources import synthetic_inputs
+from services.scheduler.stats import LatencyHistogram, SchedulerStats
+from tasks.activities import echo, echo_batch
+from tasks.shared import EchoStrategy
+from tasks.workflows import EchoStreamWorkflow, EchoWorkflow
+from temporalio.client import Client
+from temporalio.contrib.pydantic import pydantic_data_converter
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import Worker
+
+from infra.temporalio_utils.pool import ClientPool
+from infra.temporalio_utils.service import TemporalService
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+log = logging.getLogger(__name__)
+
+NAMESPACE = "default"
+PERCENTILES = (50.0, 90.0, 99.0)
+# Relative throughput drop or p99 latency rise that counts as a regression
+DEFAULT_TOLERANCE = 0.2
+# Run parameters outside of the case key that must match the baseline
+COMPARED_META = ("start_mode", "strategy")
+
+
+@dataclass(frozen=True)
+class Case:
+    concurrency: int
+    message_size: int
+    count: int
+
+    @property
+    def key(self) -> str:
+        return f"c{self.concurrency}-m{self.message_size}-n{self.count}"
+
+
+def _latency(histogram: LatencyHistogram) -> dict[str, float]:
+    """Percentiles, mean and max in milliseconds"""
+    result = {f"p{p:g}": histogram.percentile(p) * 1000 for p in PERCENTILES}
+    result["mean"] = histogram.mean * 1000
+    result["max"] = histogram.max / 1000
+    return result
+
+
+async def run_case(
+    client: Client,
+    case: Case,
+    workflows: int,
+    start_mode: StartMode,
+    strategy: EchoStrategy,
+) -> dict[str, Any]:
+    """Run one case with a fresh worker and scheduler, returns its result"""
+    task_queue = f"benchmark-{case.key}-{uuid.uuid4().hex[:8]}"
+    # Snapshots only cover the interval since the previous one, sum them up
+    total = SchedulerStats()
+    last = SchedulerStats()
+
+    def on_snapshot(stats: SchedulerStats) -> None:
+        nonlocal last
+        total.start_latency.merge(stats.start_latency)
+        total.e2e_latency.merge(stats.e2e_latency)
+        last = stats
+
+    scheduler = SchedulerService(
+        temporal_service=TemporalService({NAMESPACE: ClientPool([client])}),
+        task_queue=task_queue,
+        namespace=NAMESPACE,
+        concurrency=case.concurrency,
+        report_interval=3600,
+        start_mode=start_mode,
+        track_completion=True,
+        stats_callback=on_snapshot,
+        echo_strategy=strategy,
+    )
+    worker = Worker(
+        client,
+        task_queue=task_queue,
+        workflows=[EchoWorkflow, EchoStreamWorkflow],
+        activities=[echo, echo_batch],
+    )
+    async with worker:
+        started = time.perf_counter()
+        await scheduler.run(
+            inputs=synthetic_inputs(
+                workflows,
+                "x" * case.message_size,
+                count=case.count,
+                strategy=strategy,
+            ),
+        )
+        elapsed = time.perf_counter() - started
+
+    return {
+        **asdict(case),
+        "key": case.key,
+        "workflows": workflows,
+        "started": last.started,
+        "completed": last.completed,
+        "failed": last.failed,
+        "elapsed_s": elapsed,
+        "throughput_wfs": last.completed / elapsed if elapsed > 0 else 0,
+        "start_latency_ms": _latency(total.start_latency),
+        "e2e_latency_ms": _latency(total.e2e_latency),
+    }
+
+
+def meta_mismatches(meta: dict[str, Any], baseline_meta: dict[str, Any]) -> list[str]:
+    """Run parameters of `meta` that differ from the baseline, comparable if empty"""
+    return [
+        f"{name}: {meta.get(name)} != baseline {baseline_meta.get(name)}"
+        for name in COMPARED_META
+        if meta.get(name) != baseline_meta.get(name)
+    ]
+
+
+def compare(
+    results: list[dict[str, Any]],
+    baseline: list[dict[str, Any]],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[str]:
+    """Regressions of `results` against `baseline`, matched by case key"""
+    baseline_by_key = {result["key"]: result for result in baseline}
+    regressions = []
+    for result in results:
+        base = baseline_by_key.get(result["key"])
+        if base is None:
+            continue
+        if result["throughput_wfs"] < base["throughput_wfs"] * (1 - tolerance):
+            regressions.append(
+                f"{result['key']}: throughput {result['throughput_wfs']:.1f} wf/s "
+                f"< baseline {base['throughput_wfs']:.1f} wf/s",
+            )
+        for metric in ("start_latency_ms", "e2e_latency_ms"):
+            p99, base_p99 = result[metric]["p99"], base[metric]["p99"]
+            if base_p99 and p99 > base_p99 * (1 + tolerance):
+                regressions.append(
+                    f"{result['key']}: {metric} p99 {p99:.1f}ms "
+                    f"> baseline {base_p99:.1f}ms",
+                )
+    return regressions
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--concurrency", type=_int_list, default=[10, 50])
+    parser.add_argument("--message-sizes", type=_int_list, default=[64, 4096])
+    parser.add_argument("--counts", type=_int_list, default=[1, 3])
+    parser.add_argument("--workflows", type=int, default=500)
+    parser.add_argument(
+        "--start-mode",
+        choices=["execute", "start"],
+        default="execute",
+    )
+    parser.add_argument(
+        "--strategy",
+        choices=["sequential", "parallel", "local", "batched"],
+        default="sequential",
+    )
+    parser.add_argument("--output", type=Path, help="JSON result file")
+    parser.add_argument("--baseline", type=Path, help="JSON result file to compare")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--target", help="Existing server, e.g. localhost:7233")
+    parser.add_argument("--dev-server-path", help="Local `temporal` CLI binary")
+    return parser.parse_args(argv)
+
+
+async def _environment(args: argparse.Namespace) -> WorkflowEnvironment:
+    if args.target:
+        client = await Client.connect(
+            args.target,
+            namespace=NAMESPACE,
+            data_converter=pydantic_data_converter,
+        )
+        return WorkflowEnvironment.from_client(client)
+    return await WorkflowEnvironment.start_local(
+        namespace=NAMESPACE,
+        data_converter=pydantic_data_converter,
+        dev_server_existing_path=args.dev_server_path,
+    )
+
+
+async def async_main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    meta = {"start_mode": args.start_mode, "strategy": args.strategy}
+    baseline = None
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        # Checked before the run, verdicts across modes would be meaningless
+        mismatches = meta_mismatches(meta, baseline.get("meta", {}))
+        for line in mismatches:
+            log.error(f"Baseline {args.baseline} is not comparable, {line}")
+        if mismatches:
+            return 2
+    cases = [
+        Case(concurrency, message_size, count)
+        for concurrency, message_size, count in itertools.product(
+            args.concurrency,
+            args.message_sizes,
+            args.counts,
+        )
+    ]
+    results = []
+    async with await _environment(args) as env:
+        for case in cases:
+            log.info(f"Running {case.key} ({args.workflows} workflows)...")
+            result = await run_case(
+                env.client,
+                case,
+                args.workflows,
+                args.start_mode,
+                args.strategy,
+            )
+            log.info(
+                f"{case.key}: {result['throughput_wfs']:.1f} wf/s, "
+                f"e2e p99 {result['e2e_latency_ms']['p99']:.1f}ms, "
+                f"failed {result['failed']}",
+            )
+            results.append(result)
+
+    report = {
+        "meta": {
+            "created": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "temporalio": version("temporalio"),
+            "server": args.target or "dev-server",
+            **meta,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        log.info(f"Results written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline["results"], args.tolerance)
+        for line in regressions:
+            log.error(f"Regression {line}")
+        if regressions:
+            return 1
+        log.info(f"No regressions against {args.baseline}")
+    return 0
+
+
+def main() -> None:
+    sys.exit(asyncio.run(async_main()))
+
+
+if __name__ == "__main__":
+    main()
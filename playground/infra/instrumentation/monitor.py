@@ -0,0 +1,187 @@
+"""In-process instrumentation to tell our own Python overhead from the cluster
+
+Event loop lag is how late a periodic sleep wakes up: any lag means callbacks
+(RPC completions included) wait for the CPU, so latencies measured by the
+process are inflated by the process itself. Stage timings split a hot path
+into named stages, cProfile snapshots show where the loop thread spends time.
+"""
+
+import asyncio
+import cProfile
+import itertools
+import logging
+import os
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+
+from .settings import InstrumentationSettings
+
+log = logging.getLogger(__name__)
+
+# Seconds between event loop lag samples
+LAG_SAMPLE_INTERVAL = 0.1
+# Weight of a new lag sample in the moving average
+_LAG_SMOOTHING = 0.2
+# Coroutines listed in the task count report
+_TOP_TASKS = 3
+
+
+class LoopLagMonitor:
+    """How late a periodic sleep wakes up on the event loop
+
+    `lag` is a moving average for control loops, `pop_interval` returns the
+    mean and max since its previous call for reports.
+    """
+
+    def __init__(self, interval: float = LAG_SAMPLE_INTERVAL) -> None:
+        self._interval = interval
+        self._task: asyncio.Task[None] | None = None
+        self.lag = 0.0
+        self._samples = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def start(self) -> None:
+        """Start sampling on the running loop, once"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self._interval)
+            lag = max(loop.time() - started - self._interval, 0)
+            self.lag += (lag - self.lag) * _LAG_SMOOTHING
+            self._samples += 1
+            self._total += lag
+            self._max = max(self._max, lag)
+
+    def pop_interval(self) -> tuple[float, float]:
+        """Mean and max lag in seconds since the previous call"""
+        mean = self._total / self._samples if self._samples else 0
+        result = (mean, self._max)
+        self._samples = 0
+        self._total = 0.0
+        self._max = 0.0
+        return result
+
+
+@dataclass
+class _StageSummary:
+    count: int = 0
+    total: float = 0
+    max: float = 0
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def __str__(self) -> str:
+        mean = self.total / self.count if self.count else 0
+        return f"{self.count} mean {mean * 1000:.2f}ms max {self.max * 1000:.2f}ms"
+
+
+class StageTimings:
+    """Durations of named stages of a hot path per report interval"""
+
+    def __init__(self) -> None:
+        self._stages: dict[str, _StageSummary] = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        summary = self._stages.get(stage)
+        if summary is None:
+            summary = self._stages[stage] = _StageSummary()
+        summary.record(seconds)
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def interval_report(self) -> list[str]:
+        """Report lines since the previous report, in first-seen stage order"""
+        stages, self._stages = self._stages, {}
+        return [f"Stage {stage}: {summary}" for stage, summary in stages.items()]
+
+
+def measure(timings: StageTimings | None, stage: str) -> AbstractContextManager[None]:
+    """Time `stage` into `timings`, a no-op when instrumentation is off"""
+    return nullcontext() if timings is None else timings.measure(stage)
+
+
+class Instrumentation:
+    """Periodic loop lag, task count and stage timing reports of one process"""
+
+    def __init__(self, settings: InstrumentationSettings, name: str) -> None:
+        self._settings = settings
+        self._name = name
+        self.lag_monitor = LoopLagMonitor(settings.instrumentation_lag_sample_interval)
+        self.stage_timings = StageTimings()
+
+    def interval_report(self) -> list[str]:
+        mean_lag, max_lag = self.lag_monitor.pop_interval()
+        tasks = asyncio.all_tasks()
+        coroutines = Counter(
+            getattr(task.get_coro(), "__qualname__", "?") for task in tasks
+        )
+        top = ", ".join(
+            f"{name} {count}" for name, count in coroutines.most_common(_TOP_TASKS)
+        )
+        return [
+            f"Event loop lag: mean {mean_lag * 1000:.2f}ms max {max_lag * 1000:.2f}ms",
+            f"Asyncio tasks: {len(tasks)} ({top})",
+            *self.stage_timings.interval_report(),
+        ]
+
+    async def _profile_loop(self) -> None:
+        """Write a cProfile snapshot of the loop thread every profile interval"""
+        settings = self._settings
+        profile_dir = Path(settings.instrumentation_profile_dir)
+        # File system calls run off the loop thread, the loop is what is measured
+        await asyncio.to_thread(profile_dir.mkdir, parents=True, exist_ok=True)
+        pause = max(
+            settings.instrumentation_profile_interval
+            - settings.instrumentation_profile_duration,
+            0,
+        )
+        for snapshot in itertools.count(1):
+            await asyncio.sleep(pause)
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await asyncio.sleep(settings.instrumentation_profile_duration)
+            finally:
+                profiler.disable()
+            path = profile_dir / f"{self._name}-{os.getpid()}-{snapshot}.prof"
+            await asyncio.to_thread(profiler.dump_stats, path)
+            log.info(f"Profile snapshot written to {path}")
+
+    async def run(self) -> None:
+        """Report every interval until cancelled"""
+        self.lag_monitor.start()
+        profile_task = None
+        if self._settings.instrumentation_profile_dir:
+            profile_task = asyncio.create_task(self._profile_loop())
+        try:
+            while True:
+                await asyncio.sleep(self._settings.instrumentation_report_interval)
+                for line in self.interval_report():
+                    log.info(line)
+        finally:
+            self.lag_monitor.stop()
+            if profile_task is not None:
+                profile_task.cancel()
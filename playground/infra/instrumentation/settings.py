@@ -0,0 +1,21 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class InstrumentationSettings(BaseSettings):
+    # Log event loop lag, asyncio task counts and stage timings of this process
+    instrumentation_enabled: bool = Field(default=False, examples=[True, False])
+    # Seconds between instrumentation reports
+    instrumentation_report_interval: float = Field(default=10, gt=0, examples=[10])
+    # Seconds between event loop lag samples
+    instrumentation_lag_sample_interval: float = Field(
+        default=0.1,
+        gt=0,
+        examples=[0.1],
+    )
+    # Directory for cProfile snapshots (.prof), relative to the working
+    # directory unless absolute, "" = profiling disabled
+    instrumentation_profile_dir: str = Field(default="", examples=["profiles"])
+    # Seconds between the starts of two snapshots and seconds profiled by each
+    instrumentation_profile_interval: float = Field(default=60, gt=0, examples=[60])
+    instrumentation_profile_duration: float = Field(default=5, gt=0, examples=[5])
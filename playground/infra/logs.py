@@ -0,0 +1,132 @@
+"""Process logging setup with an optional non-blocking queue pipeline
+
+With LOG_ASYNC the root logger only puts records on an in-memory queue, a
+listener thread formats and writes them, so a slow stderr never blocks the
+event loop. Per-item messages of hot paths (one per activity, workflow start)
+are marked with `extra=PER_ITEM` and can be sampled and rate limited before
+they are queued; other messages always pass.
+"""
+
+import atexit
+import logging
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import TextIO
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+# `extra` of per-item messages subject to LOG_SAMPLE_RATE and LOG_RATE_LIMIT
+PER_ITEM = {"per_item": True}
+
+_FORMAT = "%(levelname)s:%(name)s:%(message)s"
+
+# Listener of the current async setup, replaced by the next setup_logging
+_listener: QueueListener | None = None
+
+
+class LoggingSettings(BaseSettings):
+    log_level: str = Field(default="INFO", examples=["INFO", "DEBUG"])
+    log_format: str = Field(default=_FORMAT, examples=[_FORMAT])
+    # Queue records and write them from a listener thread
+    log_async: bool = Field(default=False, examples=[True, False])
+    # Fraction of per-item messages kept, 1 = all
+    log_sample_rate: float = Field(default=1, gt=0, le=1, examples=[0.01])
+    # Per-item messages per second after sampling, 0 = unlimited
+    log_rate_limit: float = Field(default=0, ge=0, examples=[100])
+
+
+class PerItemFilter(logging.Filter):
+    """Sample and rate limit records marked with PER_ITEM
+
+    Keeps every 1/sample_rate-th marked record, then at most `rate_limit`
+    per second (token bucket with one second of burst). Counts are
+    approximate when several threads log at once.
+    """
+
+    def __init__(self, sample_rate: float = 1, rate_limit: float = 0) -> None:
+        super().__init__()
+        self._sample_rate = sample_rate
+        self._rate_limit = rate_limit
+        self._credit = 0.0
+        self._tokens = rate_limit
+        self._refilled_at = time.monotonic()
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "per_item", False):
+            return True
+        self._credit += self._sample_rate
+        if self._credit < 1:
+            self.dropped += 1
+            return False
+        self._credit -= 1
+        if self._rate_limit:
+            now = time.monotonic()
+            self._tokens = min(
+                self._tokens + (now - self._refilled_at) * self._rate_limit,
+                self._rate_limit,
+            )
+            self._refilled_at = now
+            if self._tokens < 1:
+                self.dropped += 1
+                return False
+            self._tokens -= 1
+        return True
+
+
+class LazyQueueHandler(QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread
+
+    The stock `prepare` formats the message in the logging thread. Records
+    stay in process here, so the message and args are passed as is; args
+    must not be mutated after logging.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(
+    settings: LoggingSettings,
+    stream: TextIO | None = None,
+) -> QueueListener | None:
+    """Configure the root logger, replacing its handlers and listener
+
+    Returns the started listener in async mode, it is stopped (and the
+    queue flushed) at exit or by the next call.
+    """
+    global _listener  # noqa: PLW0603
+    stop_listener()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.setLevel(settings.log_level.upper())
+
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(logging.Formatter(settings.log_format))
+    per_item_filter = PerItemFilter(settings.log_sample_rate, settings.log_rate_limit)
+    if not settings.log_async:
+        stream_handler.addFilter(per_item_filter)
+        root.addHandler(stream_handler)
+        return None
+
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = LazyQueueHandler(records)
+    # Dropped before queueing, so sampled out records cost no queue traffic
+    queue_handler.addFilter(per_item_filter)
+    root.addHandler(queue_handler)
+    _listener = QueueListener(records, stream_handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+@atexit.register
+def stop_listener() -> None:
+    """Write queued records and stop the listener thread, if any"""
+    global _listener  # noqa: PLW0603
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,48 +1,175 @@
+import asyncio
+import dataclasses
+import functools
+import logging
+from collections.abc import AsyncIterator
+
 from dependency_injector import providers
 from dependency_injector.containers import (
     DeclarativeContainer,
 )  # pylint: disable=no-name-in-module
 from pydantic_settings import BaseSettings
+from tasks.converter import echo_data_converter
 from temporalio.client import Client
 from temporalio.contrib.pydantic import pydantic_data_converter
-from temporalio.runtime import PrometheusConfig, Runtime, TelemetryConfig
+from temporalio.converter import DataConverter
+from temporalio.runtime import (
+    MetricBuffer,
+    PrometheusConfig,
+    Runtime,
+    TelemetryConfig,
+)
 
+from .codec import CompressionCodec
+from .pool import ClientPool
 from .service import TemporalService
-from .settings import parse_env_temporalio_clients
+from .settings import (
+    TemporalioClientSettings,
+    TemporalioRuntimeSettings,
+    parse_env_temporalio_clients,
+)
+
+log = logging.getLogger(__name__)
+
+# Bucket bounds (ms) of the scheduler latency histograms (services/scheduler/
+# metrics.py), the core default buckets start at 50ms, above typical RPCs
+_LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+_HISTOGRAM_BUCKET_OVERRIDES = dict.fromkeys(
+    (
+        "scheduler_queue_wait_latency",
+        "scheduler_start_latency",
+        "scheduler_e2e_latency",
+    ),
+    _LATENCY_BUCKETS_MS,
+)
 
+_DATA_CONVERTERS = {
+    "pydantic": pydantic_data_converter,
+    "struct": echo_data_converter,
+}
 
-async def get_clients() -> dict[str, Client]:
-    # Отключаем Prometheus метрики для избежания конфликта портов
-    new_runtime = Runtime(
-        telemetry=TelemetryConfig(
-            metrics=PrometheusConfig(bind_address="0.0.0.0:9000"),
+
+def get_data_converter(client_config: TemporalioClientSettings) -> DataConverter:
+    data_converter = _DATA_CONVERTERS[client_config.temporal_payload_converter]
+    if client_config.temporal_compression == "none":
+        return data_converter
+    return dataclasses.replace(
+        data_converter,
+        payload_codec=CompressionCodec(
+            algorithm=client_config.temporal_compression,
+            threshold=client_config.temporal_compression_threshold,
+            level=client_config.temporal_compression_level,
         ),
     )
-    # new_runtime = Runtime(telemetry=TelemetryConfig())
-    clients_config = parse_env_temporalio_clients()
-    clients = {}
-    for client_config in clients_config.values():
-        clients[client_config.temporal_namespace] = await Client.connect(
-            client_config.temporal_url,
-            data_converter=pydantic_data_converter,
-            namespace=client_config.temporal_namespace,
-            runtime=new_runtime,
-            api_key=client_config.temporal_api_key,
-            tls=client_config.temporal_tls,
+
+
+@functools.cache
+def get_metric_buffer() -> MetricBuffer | None:
+    """Metric buffer of the runtime, None when metrics go to Prometheus or nowhere"""
+    buffer_size = TemporalioRuntimeSettings().temporal_metrics_buffer_size
+    return MetricBuffer(buffer_size) if buffer_size > 0 else None
+
+
+@functools.cache
+def get_runtime() -> Runtime:
+    """SDK runtime shared by all clients, created once per process"""
+    # Each process needs its own Prometheus port (TEMPORAL_METRICS_BIND_ADDRESS)
+    runtime_settings = TemporalioRuntimeSettings()
+    metrics: MetricBuffer | PrometheusConfig | None = get_metric_buffer()
+    if metrics is None and runtime_settings.temporal_metrics_bind_address:
+        metrics = PrometheusConfig(
+            bind_address=runtime_settings.temporal_metrics_bind_address,
+            histogram_bucket_overrides=_HISTOGRAM_BUCKET_OVERRIDES,
         )
-    return clients
+    return Runtime(telemetry=TelemetryConfig(metrics=metrics))
+
 
+async def connect_client(
+    client_config: TemporalioClientSettings,
+    runtime: Runtime,
+) -> Client:
+    """Connect one namespace with a per-attempt timeout and retries"""
+    attempts = client_config.temporal_connect_retries + 1
+    attempt = 1
+    while True:
+        try:
+            return await asyncio.wait_for(
+                Client.connect(
+                    client_config.temporal_url,
+                    data_converter=get_data_converter(client_config),
+                    namespace=client_config.temporal_namespace,
+                    runtime=runtime,
+                    api_key=client_config.temporal_api_key,
+                    tls=client_config.temporal_tls,
+                    lazy=client_config.temporal_lazy_connect,
+                ),
+                timeout=client_config.temporal_connect_timeout,
+            )
+        except Exception as e:
+            if attempt >= attempts:
+                raise
+            delay = client_config.temporal_connect_retry_delay * 2 ** (attempt - 1)
+            log.warning(
+                f"Connect to namespace {client_config.temporal_namespace} failed "
+                f"(attempt {attempt}/{attempts}): {e!r}, retrying in {delay:.1f}s",
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
 
-def _get_service(clients: dict[str, Client]) -> "TemporalService":
-    return TemporalService(temporal_clients=clients)
+
+async def _get_client_pool(
+    client_config: TemporalioClientSettings,
+    runtime: Runtime,
+) -> ClientPool:
+    connect = functools.partial(connect_client, client_config, runtime)
+    clients = await asyncio.gather(
+        *(connect() for _ in range(client_config.temporal_client_pool_size)),
+    )
+    pool = ClientPool(list(clients), connect=connect)
+    if client_config.temporal_client_health_check_interval > 0:
+        pool.start_health_checks(client_config.temporal_client_health_check_interval)
+    return pool
+
+
+async def get_client_pools() -> dict[str, ClientPool]:
+    runtime = get_runtime()
+    clients_config = list(parse_env_temporalio_clients().values())
+    # Namespaces are connected in parallel, startup takes as long as the slowest
+    pools = await asyncio.gather(
+        *(_get_client_pool(client_config, runtime) for client_config in clients_config),
+    )
+    return {
+        client_config.temporal_namespace: pool
+        for client_config, pool in zip(clients_config, pools, strict=True)
+    }
+
+
+async def init_client_pools() -> AsyncIterator[dict[str, ClientPool]]:
+    """Client pools resource, health checks stop on container shutdown"""
+    client_pools = await get_client_pools()
+    try:
+        yield client_pools
+    finally:
+        await asyncio.gather(*(pool.close() for pool in client_pools.values()))
+
+
+def get_clients(client_pools: dict[str, ClientPool]) -> dict[str, Client]:
+    return {namespace: pool.primary for namespace, pool in client_pools.items()}
+
+
+def _get_service(client_pools: dict[str, ClientPool]) -> "TemporalService":
+    return TemporalService(client_pools=client_pools)
 
 
 class TemporalContainer(DeclarativeContainer):
     app_settings: providers.Dependency[BaseSettings] = providers.Dependency()
+    client_pools: providers.Resource[dict[str, ClientPool]] = providers.Resource(
+        init_client_pools,
+    )
     clients: providers.ThreadSafeSingleton[dict[str, Client]] = (
-        providers.ThreadSafeSingleton(get_clients)
+        providers.ThreadSafeSingleton(get_clients, client_pools=client_pools)
     )
     services: providers.Factory["TemporalService"] = providers.Factory(
         _get_service,
-        clients=clients,
+        client_pools=client_pools,
     )
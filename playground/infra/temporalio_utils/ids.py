@@ -0,0 +1,75 @@
+"""Workflow ID generators
+
+A generator maps the sequence index of a start within its run to a workflow
+ID. The server assigns history shards by a hash of the ID, so the layout does
+not change how starts spread over shards; it decides the cost of an ID and
+whether it can be traced back to a run or reproduced by a retry.
+
+- sequential: `{prefix}-{index}`, the prefix carries the run ID
+- uuid7: `{prefix}-{UUIDv7}`, time-ordered, independent of the index
+- deterministic: like sequential with a caller-supplied run ID, so a retried
+  run reproduces the IDs of the first attempt (idempotent starts)
+- uuid4: `{prefix}-{uuid4}`, one os.urandom call per ID
+"""
+
+import random
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Literal
+
+WorkflowIdScheme = Literal["sequential", "uuid7", "deterministic", "uuid4"]
+WorkflowIdGenerator = Callable[[int], str]
+
+_UUID7_MAX_COUNTER = 0xFFF
+
+
+def new_run_id() -> str:
+    """Short time-ordered run ID, e.g. 20240610-153012-3f9a"""
+    return f"{datetime.now(UTC):%Y%m%d-%H%M%S}-{random.getrandbits(16):04x}"
+
+
+class Uuid7:
+    """UUIDv7 (RFC 9562) strings, monotonic within the generator
+
+    The 12-bit rand_a field is a counter within one millisecond (RFC method 1),
+    on overflow the timestamp moves ahead. Random bits come from the
+    `random` module instead of os.urandom: unique, not unpredictable.
+    """
+
+    def __init__(self) -> None:
+        self._last_ms = 0
+        self._counter = 0
+
+    def __call__(self) -> str:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > self._last_ms:
+            self._last_ms = now_ms
+            # Random start leaves half of the counter space for the same ms
+            self._counter = random.getrandbits(11)
+        elif self._counter < _UUID7_MAX_COUNTER:
+            self._counter += 1
+        else:
+            self._last_ms += 1
+            self._counter = 0
+        value = (
+            self._last_ms << 80
+            | 0x7 << 76
+            | self._counter << 64
+            | 0b10 << 62
+            | random.getrandbits(62)
+        )
+        digits = f"{value:032x}"
+        return (
+            f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+        )
+
+
+def workflow_id_generator(scheme: WorkflowIdScheme, prefix: str) -> WorkflowIdGenerator:
+    if scheme == "uuid7":
+        uuid7 = Uuid7()
+        return lambda _: f"{prefix}-{uuid7()}"
+    if scheme == "uuid4":
+        return lambda _: f"{prefix}-{uuid.uuid4()}"
+    return lambda index: f"{prefix}-{index}"
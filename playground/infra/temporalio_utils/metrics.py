@@ -0,0 +1,109 @@
+"""Per-interval worker metrics from the SDK runtime metric buffer
+
+With TEMPORAL_METRICS_BUFFER_SIZE > 0 the runtime keeps core SDK metrics in
+a MetricBuffer instead of exporting them to Prometheus. WorkerMetricsCollector
+drains the buffer and summarizes workflow task, sticky cache, replay and
+activity queue metrics per interval, to see whether sticky execution helps.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from temporalio.runtime import (
+    BUFFERED_METRIC_KIND_COUNTER,
+    BUFFERED_METRIC_KIND_GAUGE,
+    MetricBuffer,
+)
+
+log = logging.getLogger(__name__)
+
+# Seconds between buffer drains, the buffer has a fixed size
+DRAIN_INTERVAL = 1.0
+
+_METRIC_PREFIX = "temporal_"
+
+
+@dataclass
+class _Summary:
+    """Count, sum and max of histogram values (milliseconds)"""
+
+    count: int = 0
+    total: float = 0
+    max: float = 0
+
+    def record(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def __str__(self) -> str:
+        mean = self.total / self.count if self.count else 0
+        return f"{self.count} (mean {mean:.1f}ms, max {self.max:.1f}ms)"
+
+
+class WorkerMetricsCollector:
+    def __init__(self, buffer: MetricBuffer) -> None:
+        self._buffer = buffer
+        self._counters: dict[str, float] = {}
+        self._gauges: dict[str, float] = {}
+        self._histograms: dict[str, _Summary] = {}
+
+    def drain(self) -> None:
+        """Move buffered updates into the current interval"""
+        for update in self._buffer.retrieve_updates():
+            metric = update.metric
+            name = metric.name.removeprefix(_METRIC_PREFIX)
+            if metric.kind == BUFFERED_METRIC_KIND_COUNTER:
+                self._counters[name] = self._counters.get(name, 0) + update.value
+            elif metric.kind == BUFFERED_METRIC_KIND_GAUGE:
+                self._gauges[name] = update.value
+            else:
+                self._histograms.setdefault(name, _Summary()).record(update.value)
+
+    def _counter(self, name: str) -> int:
+        return int(self._counters.get(name, 0))
+
+    def _histogram(self, name: str) -> _Summary:
+        return self._histograms.get(name, _Summary())
+
+    def interval_report(self) -> list[str]:
+        """Report lines of the interval since the previous report"""
+        self.drain()
+        hits = self._counter("sticky_cache_hit")
+        misses = self._counter("sticky_cache_miss")
+        lookups = hits + misses
+        hit_ratio = hits / lookups if lookups else 0
+        tasks = self._histogram("workflow_task_execution_latency")
+        failed = self._counter("workflow_task_execution_failed")
+        evictions = self._counter("sticky_cache_total_forced_eviction")
+        cache_size = int(self._gauges.get("sticky_cache_size", 0))
+        replays = self._histogram("workflow_task_replay_latency")
+        activities = self._histogram("activity_execution_latency")
+        queue_time = self._histogram("activity_schedule_to_start_latency")
+        lines = [
+            f"Workflow tasks: {tasks} Failed: {failed}",
+            (
+                f"Sticky cache: hits {hits} misses {misses} ({hit_ratio:.1%} hit) "
+                f"evictions {evictions} size {cache_size}"
+            ),
+            f"Replays: {replays}",
+            f"Activity tasks: {activities} queue time {queue_time}",
+        ]
+        # Gauges keep their last value across intervals
+        self._counters.clear()
+        self._histograms.clear()
+        return lines
+
+    async def run(self, report_interval: float) -> None:
+        """Drain the buffer continuously and log a report every interval"""
+        loop = asyncio.get_running_loop()
+        next_report = loop.time() + report_interval
+        while True:
+            await asyncio.sleep(min(DRAIN_INTERVAL, report_interval))
+            if loop.time() < next_report:
+                self.drain()
+                continue
+            next_report += report_interval
+            for line in self.interval_report():
+                log.info(line)
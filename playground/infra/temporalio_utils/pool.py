@@ -0,0 +1,101 @@
+import asyncio
+import contextlib
+import logging
+from collections.abc import Awaitable, Callable, Iterator
+from datetime import timedelta
+
+from temporalio.client import Client
+
+log = logging.getLogger(__name__)
+
+
+class ClientPool:
+    """Several clients (separate gRPC connections) of one namespace
+
+    A single HTTP/2 connection caps the number of concurrent streams, so at high
+    RPC rates calls are spread over K connections. `lease` picks the client
+    with the fewest in-flight calls, rotating the starting point on ties.
+    """
+
+    def __init__(
+        self,
+        clients: list[Client],
+        connect: Callable[[], Awaitable[Client]] | None = None,
+    ) -> None:
+        if not clients:
+            raise ValueError("ClientPool needs at least one client")
+        self._clients = clients
+        self._connect = connect
+        self._in_flight = [0] * len(clients)
+        self._next = 0
+        self._health_task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        """Number of client connections in the pool"""
+        return len(self._clients)
+
+    @property
+    def primary(self) -> Client:
+        """Client for long-lived users such as workers"""
+        return self._clients[0]
+
+    def _select(self) -> int:
+        start = self._next
+        self._next = (start + 1) % len(self._clients)
+        best = start
+        for offset in range(1, len(self._clients)):
+            index = (start + offset) % len(self._clients)
+            if self._in_flight[index] < self._in_flight[best]:
+                best = index
+        return best
+
+    @contextlib.contextmanager
+    def lease(self) -> Iterator[Client]:
+        """Least-loaded client for the duration of one call"""
+        index = self._select()
+        self._in_flight[index] += 1
+        try:
+            yield self._clients[index]
+        finally:
+            self._in_flight[index] -= 1
+
+    async def check_health(self, timeout: float = 5) -> None:
+        """Check every client and replace unhealthy ones with a new connection
+
+        The primary client is replaced too: a worker keeps the client it was
+        created with, later leases and `primary` get the new connection.
+        """
+        for index, client in enumerate(self._clients):
+            try:
+                await client.service_client.check_health(
+                    timeout=timedelta(seconds=timeout),
+                )
+            except Exception as e:
+                log.warning(f"Client {index} of {client.namespace} is unhealthy: {e!r}")
+                if self._connect is None:
+                    continue
+                try:
+                    self._clients[index] = await self._connect()
+                    log.info(f"Client {index} of {client.namespace} reconnected")
+                except Exception as connect_error:
+                    log.warning(
+                        f"Reconnect of client {index} of {client.namespace} "
+                        f"failed: {connect_error!r}",
+                    )
+
+    async def _health_check_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.check_health()
+
+    def start_health_checks(self, interval: float) -> None:
+        if self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_check_loop(interval))
+
+    async def close(self) -> None:
+        """Stop the health checks, the clients need no explicit close"""
+        if self._health_task is None:
+            return
+        self._health_task.cancel()
+        await asyncio.gather(self._health_task, return_exceptions=True)
+        self._health_task = None
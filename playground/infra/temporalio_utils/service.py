@@ -1,27 +1,162 @@
-import uuid
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
 
-from tasks.shared import EchoWorkflowInput
-from temporalio.client import Client
+from tasks.shared import (
+    STREAM_CONTINUING_AS_NEW,
+    EchoActivityInput,
+    EchoStrategy,
+    EchoStreamInput,
+    EchoWorkflowInput,
+    EchoWorkflowResult,
+)
+from temporalio.client import (
+    WithStartWorkflowOperation,
+    WorkflowHandle,
+    WorkflowUpdateFailedError,
+)
+from temporalio.common import (
+    RawValue,
+    TypedSearchAttributes,
+    WorkflowIDConflictPolicy,
+    WorkflowIDReusePolicy,
+)
+from temporalio.exceptions import ApplicationError
+
+from infra.instrumentation.monitor import StageTimings, measure
+
+from .ids import WorkflowIdGenerator, new_run_id, workflow_id_generator
+from .pool import ClientPool
+
+WORKFLOW_ID_PREFIX = "echo-workflow"
+STREAM_ID_PREFIX = "echo-stream"
+
+# Retries of updates rejected while the stream workflow continues as new,
+# the first retry waits _UPDATE_RETRY_DELAY seconds, doubled per attempt
+_UPDATE_RETRIES = 8
+_UPDATE_RETRY_DELAY = 0.05
+
+# Default IDs of single starts, time-ordered without os.urandom per start
+_default_workflow_id = workflow_id_generator("uuid7", WORKFLOW_ID_PREFIX)
+
+
+def _continuing_as_new(error: WorkflowUpdateFailedError) -> bool:
+    cause = error.cause
+    return (
+        isinstance(cause, ApplicationError) and cause.type == STREAM_CONTINUING_AS_NEW
+    )
+
+
+@dataclass(frozen=True)
+class StartOptions:
+    """Options of EchoWorkflow starts shared by a run"""
+
+    # E.g. {"run_id": ...} to find the workflows of a run
+    memo: Mapping[str, Any] | None = None
+    # Registered custom search attributes, e.g. a keyword run ID
+    search_attributes: TypedSearchAttributes | None = None
+    # REJECT_DUPLICATE makes retried starts with reproduced IDs idempotent
+    id_reuse_policy: WorkflowIDReusePolicy = WorkflowIDReusePolicy.ALLOW_DUPLICATE
+
+
+_DEFAULT_START_OPTIONS = StartOptions()
+
+
+@dataclass
+class WorkflowStartResult:
+    index: int
+    workflow_id: str
+    handle: WorkflowHandle[Any, EchoWorkflowResult] | None = None
+    error: Exception | None = None
+    # time.perf_counter() before the start RPC and its duration in seconds
+    started_at: float = 0.0
+    latency: float = 0.0
 
 
 class TemporalService:
     def __init__(
         self,
-        temporal_clients: dict[str, Client],
+        client_pools: dict[str, ClientPool],
     ) -> None:
-        self._temporal_clients = temporal_clients
+        self._client_pools = client_pools
 
-    async def _terminate(self, namespace: str, workflow_id: str):
+    async def _terminate(self, namespace: str, workflow_id: str) -> bool:
         try:
-            await (
-                self._temporal_clients[namespace]
-                .get_workflow_handle(
-                    workflow_id,
-                )
-                .terminate()
-            )
+            with self._client_pools[namespace].lease() as client:
+                await client.get_workflow_handle(workflow_id).terminate()
         except:  # noqa
-            pass
+            return False
+        return True
+
+    async def terminate_workflows(
+        self,
+        namespace: str,
+        workflow_ids: Iterable[str],
+        max_in_flight: int = 100,
+    ) -> int:
+        """Terminate workflows, at most `max_in_flight` RPCs at once
+
+        Returns the number of terminated workflows, failures (e.g. already
+        closed workflows) are skipped.
+        """
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def terminate_one(workflow_id: str) -> bool:
+            async with semaphore:
+                return await self._terminate(namespace, workflow_id)
+
+        results = await asyncio.gather(
+            *(terminate_one(workflow_id) for workflow_id in workflow_ids),
+        )
+        return sum(results)
+
+    async def start_echo_workflow(
+        self,
+        namespace: str,
+        task_queue: str,
+        message: str = "Hello World",
+        count: int = 1,
+        *,
+        strategy: EchoStrategy = "sequential",
+        timings: StageTimings | None = None,
+        workflow_id: str | None = None,
+        options: StartOptions = _DEFAULT_START_OPTIONS,
+    ) -> WorkflowHandle[Any, EchoWorkflowResult]:
+        """Starts EchoWorkflow without waiting for its result and returns the handle
+
+        Without `workflow_id` a time-ordered (UUIDv7) ID is generated.
+        With `timings` the "serialize" and "start_rpc" stages are recorded,
+        the payload codec runs inside the RPC stage.
+        """
+        if workflow_id is None:
+            workflow_id = _default_workflow_id(0)
+        workflow_input = EchoWorkflowInput(
+            message=message,
+            count=count,
+            strategy=strategy,
+        )
+
+        with self._client_pools[namespace].lease() as client:
+            # Serialized up front so the stage is measured apart from the RPC
+            with measure(timings, "serialize"):
+                payload = RawValue(
+                    client.data_converter.payload_converter.to_payloads(
+                        [workflow_input],
+                    )[0],
+                )
+            with measure(timings, "start_rpc"):
+                return await client.start_workflow(
+                    "EchoWorkflow",
+                    payload,
+                    id=workflow_id,
+                    task_queue=task_queue,
+                    result_type=EchoWorkflowResult,
+                    memo=options.memo,
+                    search_attributes=options.search_attributes,
+                    id_reuse_policy=options.id_reuse_policy,
+                )
 
     async def execute_echo_workflow(
         self,
@@ -29,16 +164,256 @@ class TemporalService:
         task_queue: str,
         message: str = "Hello World",
         count: int = 1,
+        *,
+        strategy: EchoStrategy = "sequential",
+        workflow_id: str | None = None,
     ) -> str:
-        """Starts EchoWorkflow and returns workflow_id"""
-        workflow_id = f"echo-workflow-{uuid.uuid4()}"
-        workflow_input = EchoWorkflowInput(message=message, count=count)
-
-        await self._temporal_clients[namespace].execute_workflow(
-            "EchoWorkflow",
-            workflow_input,
-            id=workflow_id,
+        """Starts EchoWorkflow, waits for completion and returns workflow_id"""
+        handle = await self.start_echo_workflow(
+            namespace=namespace,
             task_queue=task_queue,
+            message=message,
+            count=count,
+            strategy=strategy,
+            workflow_id=workflow_id,
+        )
+        await handle.result()
+
+        return handle.id
+
+    async def signal_with_start_echo_stream(
+        self,
+        namespace: str,
+        task_queue: str,
+        workflow_id: str,
+        message: str = "Hello World",
+        *,
+        max_history_length: int = 10_000,
+        max_history_size: int = 10 * 1024 * 1024,
+        options: StartOptions = _DEFAULT_START_OPTIONS,
+    ) -> WorkflowHandle[Any, int]:
+        """Sends a message to EchoStreamWorkflow, starting it if it isn't running
+
+        The history thresholds, memo and search attributes of `options` only
+        apply when the workflow is started.
+        """
+        with self._client_pools[namespace].lease() as client:
+            return await client.start_workflow(
+                "EchoStreamWorkflow",
+                EchoStreamInput(
+                    max_history_length=max_history_length,
+                    max_history_size=max_history_size,
+                ),
+                id=workflow_id,
+                task_queue=task_queue,
+                start_signal="echo",
+                start_signal_args=[EchoActivityInput(message=message)],
+                result_type=int,
+                memo=options.memo,
+                search_attributes=options.search_attributes,
+            )
+
+    async def stop_echo_stream(self, namespace: str, workflow_id: str) -> None:
+        """Asks EchoStreamWorkflow to complete once pending messages are echoed"""
+        with self._client_pools[namespace].lease() as client:
+            await client.get_workflow_handle(workflow_id).signal("stop")
+
+    async def execute_echo_update(
+        self,
+        namespace: str,
+        task_queue: str,
+        workflow_id: str,
+        message: str = "Hello World",
+        *,
+        count: int = 1,
+        strategy: EchoStrategy = "sequential",
+        with_start: bool = True,
+        max_history_length: int = 10_000,
+        max_history_size: int = 10 * 1024 * 1024,
+        options: StartOptions = _DEFAULT_START_OPTIONS,
+    ) -> str:
+        """Echoes through the "echo_sync" update of EchoStreamWorkflow `workflow_id`
+
+        With `with_start` the workflow is started by update-with-start if it
+        isn't running (with the memo and search attributes of `options`),
+        otherwise it must already be running. Returns the echoed message once
+        the update completed. Updates rejected while the workflow continues as
+        new are retried with backoff.
+        """
+        workflow_input = EchoWorkflowInput(
+            message=message,
+            count=count,
+            strategy=strategy,
         )
+        attempt = 0
+        while True:
+            try:
+                with self._client_pools[namespace].lease() as client:
+                    if not with_start:
+                        handle = client.get_workflow_handle(workflow_id)
+                        return await handle.execute_update(
+                            "echo_sync",
+                            workflow_input,
+                            result_type=str,
+                        )
+                    return await client.execute_update_with_start_workflow(
+                        "echo_sync",
+                        workflow_input,
+                        start_workflow_operation=WithStartWorkflowOperation(
+                            "EchoStreamWorkflow",
+                            EchoStreamInput(
+                                max_history_length=max_history_length,
+                                max_history_size=max_history_size,
+                            ),
+                            id=workflow_id,
+                            task_queue=task_queue,
+                            id_conflict_policy=WorkflowIDConflictPolicy.USE_EXISTING,
+                            memo=options.memo,
+                            search_attributes=options.search_attributes,
+                        ),
+                        result_type=str,
+                    )
+            except WorkflowUpdateFailedError as e:
+                if attempt == _UPDATE_RETRIES or not _continuing_as_new(e):
+                    raise
+            # The update reaches the next run once it started
+            await asyncio.sleep(_UPDATE_RETRY_DELAY * 2**attempt)
+            attempt += 1
 
-        return workflow_id
+    async def iter_start_echo_workflows(
+        self,
+        namespace: str,
+        task_queue: str,
+        inputs: Iterable[EchoWorkflowInput],
+        max_in_flight: int = 100,
+        *,
+        workflow_ids: WorkflowIdGenerator | None = None,
+        options: StartOptions = _DEFAULT_START_OPTIONS,
+        timings: StageTimings | None = None,
+        in_flight_callback: Callable[[int], None] | None = None,
+    ) -> AsyncIterator[WorkflowStartResult]:
+        """Start EchoWorkflows for `inputs` and yield results as they complete
+
+        Inputs are pulled lazily, at most `max_in_flight` start RPCs run at
+        once. `workflow_ids` maps the input index to the workflow ID, by
+        default `echo-workflow-{new run ID}-{index}`. Failed starts are
+        yielded with `error` set. Closing the iterator cancels the starts that
+        are still in flight. With `timings` the "serialize" and "start_rpc"
+        stages are recorded like in `start_echo_workflow`.
+        `in_flight_callback` receives the number of starts in flight whenever
+        it changes, including starts whose result is not consumed yet.
+        """
+        pool = self._client_pools[namespace]
+        if workflow_ids is None:
+            workflow_ids = workflow_id_generator(
+                "sequential",
+                f"{WORKFLOW_ID_PREFIX}-{new_run_id()}",
+            )
+        source = enumerate(inputs)
+        results: asyncio.Queue[WorkflowStartResult | None] = asyncio.Queue(
+            maxsize=max_in_flight,
+        )
+        workers: list[asyncio.Task[None]] = []
+        in_flight = 0
+
+        def set_in_flight(delta: int) -> None:
+            nonlocal in_flight
+            in_flight += delta
+            if in_flight_callback is not None:
+                in_flight_callback(in_flight)
+
+        async def start_one(
+            index: int,
+            workflow_input: EchoWorkflowInput,
+        ) -> WorkflowStartResult:
+            result = WorkflowStartResult(index=index, workflow_id=workflow_ids(index))
+            result.started_at = time.perf_counter()
+            try:
+                with pool.lease() as client:
+                    with measure(timings, "serialize"):
+                        payload = RawValue(
+                            client.data_converter.payload_converter.to_payloads(
+                                [workflow_input],
+                            )[0],
+                        )
+                    with measure(timings, "start_rpc"):
+                        result.handle = await client.start_workflow(
+                            "EchoWorkflow",
+                            payload,
+                            id=result.workflow_id,
+                            task_queue=task_queue,
+                            result_type=EchoWorkflowResult,
+                            memo=options.memo,
+                            search_attributes=options.search_attributes,
+                            id_reuse_policy=options.id_reuse_policy,
+                        )
+            except Exception as e:
+                result.error = e
+            result.latency = time.perf_counter() - result.started_at
+            return result
+
+        async def start_worker() -> None:
+            # All workers share one iterator, so inputs are never materialized
+            for index, workflow_input in source:
+                # In flight until the consumer takes the result
+                set_in_flight(1)
+                try:
+                    await results.put(await start_one(index, workflow_input))
+                except BaseException:
+                    set_in_flight(-1)
+                    raise
+
+        async def start_workers() -> None:
+            workers.extend(
+                asyncio.create_task(start_worker()) for _ in range(max_in_flight)
+            )
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                # An error of the input iterator stops the other workers too
+                for worker in workers:
+                    worker.cancel()
+                # Cancelled by the consumer, nobody waits for the end marker
+                task = asyncio.current_task()
+                if task is None or not task.cancelling():
+                    await results.put(None)
+
+        runner = asyncio.create_task(start_workers())
+        try:
+            while (result := await results.get()) is not None:
+                set_in_flight(-1)
+                yield result
+            # Re-raise errors of the input iterator
+            await runner
+        finally:
+            for task in (runner, *workers):
+                task.cancel()
+            await asyncio.gather(runner, *workers, return_exceptions=True)
+            # Results left in the queue are not consumed
+            if in_flight:
+                set_in_flight(-in_flight)
+
+    async def start_echo_workflows_batch(
+        self,
+        namespace: str,
+        task_queue: str,
+        inputs: Iterable[EchoWorkflowInput],
+        max_in_flight: int = 100,
+        *,
+        workflow_ids: WorkflowIdGenerator | None = None,
+        options: StartOptions = _DEFAULT_START_OPTIONS,
+    ) -> list[WorkflowStartResult]:
+        """Start EchoWorkflows for `inputs`, results are ordered like inputs"""
+        results = [
+            result
+            async for result in self.iter_start_echo_workflows(
+                namespace=namespace,
+                task_queue=task_queue,
+                inputs=inputs,
+                max_in_flight=max_in_flight,
+                workflow_ids=workflow_ids,
+                options=options,
+            )
+        ]
+        results.sort(key=lambda result: result.index)
+        return results
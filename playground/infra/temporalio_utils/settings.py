@@ -1,15 +1,22 @@
 import logging
 import os
+from datetime import timedelta
+from typing import Literal
 
-from pydantic import Field
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from temporalio.worker import (
+    CustomSlotSupplier,
     ResourceBasedSlotConfig,
     ResourceBasedSlotSupplier,
     ResourceBasedTunerConfig,
     WorkerTuner,
 )
 
+from infra.instrumentation.monitor import LoopLagMonitor
+
+from .tuner import AdaptiveSlotSupplier
+
 log = logging.getLogger(__name__)
 
 
@@ -18,19 +25,97 @@ class TemporalioClientSettings(BaseSettings):
     temporal_namespace: str = Field(default="default", examples=["default"])
     temporal_api_key: str | None = Field(default=None, examples=["1234567890"])
     temporal_tls: bool = Field(default=False, examples=[True, False])
+    temporal_connect_timeout: float = Field(default=10, gt=0, examples=[10])
+    temporal_connect_retries: int = Field(default=3, ge=0, examples=[3])
+    temporal_connect_retry_delay: float = Field(default=1, ge=0, examples=[1])
+    # Connect on first RPC instead of at startup (not usable by workers)
+    temporal_lazy_connect: bool = Field(default=False, examples=[True, False])
+    # Number of clients (gRPC connections) per namespace used by TemporalService
+    temporal_client_pool_size: int = Field(default=1, ge=1, examples=[4])
+    # "struct" packs echo task inputs into a compact binary format, workers must
+    # be switched before clients, see tasks/converter.py
+    temporal_payload_converter: Literal["pydantic", "struct"] = Field(
+        default="pydantic",
+        examples=["pydantic", "struct"],
+    )
+    # Compress payloads of at least threshold bytes, workers decode any algorithm
+    # once enabled, "zstd" requires the zstandard package
+    temporal_compression: Literal["none", "zlib", "zstd"] = Field(
+        default="none",
+        examples=["none", "zlib", "zstd"],
+    )
+    temporal_compression_threshold: int = Field(default=1024, ge=0, examples=[1024])
+    # None = algorithm default (zlib 1, zstd 3)
+    temporal_compression_level: int | None = Field(default=None, examples=[6])
+    # Seconds between health checks of pooled connections, 0 = disabled
+    temporal_client_health_check_interval: float = Field(
+        default=30,
+        ge=0,
+        examples=[30],
+    )
+
+
+class TemporalioRuntimeSettings(BaseSettings):
+    # Prometheus endpoint of the SDK metrics, "" = not exported
+    temporal_metrics_bind_address: str = Field(
+        default="0.0.0.0:9000",
+        examples=["0.0.0.0:9000", ""],
+    )
+    # >0 keeps SDK metrics in a buffer of this size for in-process reports
+    # (see metrics.py) instead of exporting them to Prometheus, the runtime has
+    # one metrics sink so the bind address must be empty
+    temporal_metrics_buffer_size: int = Field(default=0, ge=0, examples=[100_000])
+
+    @model_validator(mode="after")
+    def _validate_metrics_sink(self) -> "TemporalioRuntimeSettings":
+        if self.temporal_metrics_buffer_size > 0 and self.temporal_metrics_bind_address:
+            raise ValueError(
+                "temporal_metrics_buffer_size replaces the Prometheus exporter, "
+                "set temporal_metrics_bind_address to an empty string to use it "
+                f"instead of {self.temporal_metrics_bind_address}",
+            )
+        return self
 
 
 class TemporalioWorkerSettings(BaseSettings):
     temporal_worker_namespace: str = Field(examples=["default"])
     temporal_worker_task_queue: str = Field(examples=["default"])
-    temporal_worker_target_cpu: float = Field(default=0.9, examples=[0.9])
-    temporal_worker_target_ram: float = Field(default=0.8, examples=[0.8])
-    temporal_worker_workflows_min_slots: int = Field(default=10, examples=[10])
-    temporal_worker_workflows_max_slots: int = Field(default=500, examples=[500])
-    temporal_worker_activities_min_slots: int = Field(default=50, examples=[50])
-    temporal_worker_activities_max_slots: int = Field(default=500, examples=[500])
-    temporal_worker_local_activities_min_slots: int = Field(default=50, examples=[50])
-    temporal_worker_local_activities_max_slots: int = Field(default=500, examples=[500])
+    # "fixed" = max slots of each kind, "resource" = CPU/RAM targets,
+    # "adaptive" = loop lag and task latency, see tuner.py
+    temporal_worker_tuner: Literal["fixed", "resource", "adaptive"] = Field(
+        default="resource",
+        examples=["fixed", "resource", "adaptive"],
+    )
+    temporal_worker_target_cpu: float = Field(default=0.9, gt=0, le=1, examples=[0.9])
+    temporal_worker_target_ram: float = Field(default=0.8, gt=0, le=1, examples=[0.8])
+    temporal_worker_workflows_min_slots: int = Field(default=10, ge=1, examples=[10])
+    temporal_worker_workflows_max_slots: int = Field(default=500, ge=1, examples=[500])
+    temporal_worker_activities_min_slots: int = Field(default=50, ge=1, examples=[50])
+    temporal_worker_activities_max_slots: int = Field(default=500, ge=1, examples=[500])
+    temporal_worker_local_activities_min_slots: int = Field(
+        default=50,
+        ge=1,
+        examples=[50],
+    )
+    temporal_worker_local_activities_max_slots: int = Field(
+        default=500,
+        ge=1,
+        examples=[500],
+    )
+    # Adaptive tuner: seconds of event loop lag that shrink the slot limits
+    temporal_worker_adaptive_max_loop_lag: float = Field(
+        default=0.05,
+        gt=0,
+        examples=[0.05],
+    )
+    # Adaptive tuner: task latency over baseline ratio that shrinks the limits
+    temporal_worker_adaptive_latency_tolerance: float = Field(
+        default=2.0,
+        gt=1,
+        examples=[2.0],
+    )
+    # Adaptive tuner: seconds between slot limit adjustments
+    temporal_worker_adaptive_interval: float = Field(default=1, gt=0, examples=[1])
     temporal_worker_max_concurrent_workflow_task_polls: int = Field(
         default=100,
         examples=[100],
@@ -43,41 +128,112 @@ class TemporalioWorkerSettings(BaseSettings):
         default=0.8,
         examples=[0.8],
     )
+    # Sticky cache size, each cached workflow keeps its state in memory
+    temporal_worker_max_cached_workflows: int = Field(
+        default=1000,
+        ge=0,
+        examples=[1000],
+    )
+    # Seconds between worker metric reports when the metric buffer is enabled
+    temporal_worker_metrics_log_interval: float = Field(
+        default=10,
+        gt=0,
+        examples=[10],
+    )
+    # Seconds running activities get to finish after shutdown was requested
+    temporal_worker_graceful_shutdown_timeout: float = Field(
+        default=30,
+        ge=0,
+        examples=[30],
+    )
 
-    def temporal_worker_settings(self):
-        resource_based_options = ResourceBasedTunerConfig(
-            self.temporal_worker_target_cpu,
-            self.temporal_worker_target_ram,
-        )
-        tuner = WorkerTuner.create_composite(
-            workflow_supplier=ResourceBasedSlotSupplier(
-                ResourceBasedSlotConfig(
-                    minimum_slots=self.temporal_worker_workflows_min_slots,
-                    maximum_slots=self.temporal_worker_workflows_max_slots,
-                ),
-                resource_based_options,
+    @model_validator(mode="after")
+    def _validate_slots(self) -> "TemporalioWorkerSettings":
+        for kind in ("workflows", "activities", "local_activities"):
+            min_slots = getattr(self, f"temporal_worker_{kind}_min_slots")
+            max_slots = getattr(self, f"temporal_worker_{kind}_max_slots")
+            if min_slots > max_slots:
+                raise ValueError(
+                    f"temporal_worker_{kind}_min_slots ({min_slots}) is greater "
+                    f"than temporal_worker_{kind}_max_slots ({max_slots})",
+                )
+        return self
+
+    def _slot_bounds(self) -> dict[str, tuple[int, int]]:
+        return {
+            "workflow": (
+                self.temporal_worker_workflows_min_slots,
+                self.temporal_worker_workflows_max_slots,
             ),
-            activity_supplier=ResourceBasedSlotSupplier(
-                ResourceBasedSlotConfig(
-                    minimum_slots=self.temporal_worker_activities_min_slots,
-                    maximum_slots=self.temporal_worker_activities_max_slots,
-                ),
-                resource_based_options,
+            "activity": (
+                self.temporal_worker_activities_min_slots,
+                self.temporal_worker_activities_max_slots,
             ),
-            local_activity_supplier=ResourceBasedSlotSupplier(
-                ResourceBasedSlotConfig(
-                    minimum_slots=self.temporal_worker_local_activities_min_slots,
-                    maximum_slots=self.temporal_worker_activities_max_slots,
-                ),
-                resource_based_options,
+            "local_activity": (
+                self.temporal_worker_local_activities_min_slots,
+                self.temporal_worker_local_activities_max_slots,
             ),
+        }
+
+    def build_tuner(self) -> WorkerTuner:
+        bounds = self._slot_bounds()
+        if self.temporal_worker_tuner == "fixed":
+            return WorkerTuner.create_fixed(
+                workflow_slots=bounds["workflow"][1],
+                activity_slots=bounds["activity"][1],
+                local_activity_slots=bounds["local_activity"][1],
+            )
+
+        suppliers: dict[str, CustomSlotSupplier | ResourceBasedSlotSupplier]
+        if self.temporal_worker_tuner == "adaptive":
+            # One lag sampler for the suppliers sharing the loop
+            lag_monitor = LoopLagMonitor()
+            suppliers = {
+                kind: AdaptiveSlotSupplier(
+                    kind,
+                    min_slots,
+                    max_slots,
+                    lag_monitor,
+                    max_loop_lag=self.temporal_worker_adaptive_max_loop_lag,
+                    latency_tolerance=self.temporal_worker_adaptive_latency_tolerance,
+                    adjust_interval=self.temporal_worker_adaptive_interval,
+                )
+                for kind, (min_slots, max_slots) in bounds.items()
+            }
+        else:
+            resource_based_options = ResourceBasedTunerConfig(
+                target_memory_usage=self.temporal_worker_target_ram,
+                target_cpu_usage=self.temporal_worker_target_cpu,
+            )
+            suppliers = {
+                kind: ResourceBasedSlotSupplier(
+                    ResourceBasedSlotConfig(
+                        minimum_slots=min_slots,
+                        maximum_slots=max_slots,
+                    ),
+                    resource_based_options,
+                )
+                for kind, (min_slots, max_slots) in bounds.items()
+            }
+        return WorkerTuner.create_composite(
+            workflow_supplier=suppliers["workflow"],
+            activity_supplier=suppliers["activity"],
+            local_activity_supplier=suppliers["local_activity"],
         )
+
+    def temporal_worker_settings(self):
+        tuner = self.build_tuner()
+        log.info(f"Worker tuner: {self.temporal_worker_tuner}")
         return {
             "tuner": tuner,
             # "build_id": self.app_version,
             "max_concurrent_workflow_task_polls": self.temporal_worker_max_concurrent_workflow_task_polls,
             "max_concurrent_activity_task_polls": self.temporal_worker_max_concurrent_activity_task_polls,
             "nonsticky_to_sticky_poll_ratio": self.temporal_worker_nonsticky_to_sticky_poll_ratio,
+            "max_cached_workflows": self.temporal_worker_max_cached_workflows,
+            "graceful_shutdown_timeout": timedelta(
+                seconds=self.temporal_worker_graceful_shutdown_timeout,
+            ),
         }
 
 
@@ -0,0 +1,189 @@
+"""Adaptive slot supplier for the worker tuner
+
+The resource-based tuner only looks at host CPU and RAM, which stay low while a
+single worker process is bound by its event loop. AdaptiveSlotSupplier
+changes its slot limit by AIMD instead: it adds slots while most of them are in
+use and cuts the limit when the event loop lags or the task latency rises
+well above the best recently observed one.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+
+from temporalio.worker import (
+    CustomSlotSupplier,
+    SlotMarkUsedContext,
+    SlotPermit,
+    SlotReleaseContext,
+    SlotReserveContext,
+)
+
+from infra.instrumentation.monitor import LoopLagMonitor
+
+log = logging.getLogger(__name__)
+
+# Slots in use above this fraction of the limit count as demand for more
+_SATURATION = 0.8
+_INCREASE_FACTOR = 0.1
+_DECREASE_FACTOR = 0.75
+# Baseline latency rises by this factor per adjustment without a new minimum,
+# so a single fast interval doesn't pin it forever
+_BASELINE_DRIFT = 1.1
+
+
+class _AdaptivePermit(SlotPermit):
+    def __init__(self) -> None:
+        self.used_at: float | None = None
+
+
+class AdaptiveSlotSupplier(CustomSlotSupplier):
+    """Slot supplier with a limit between `min_slots` and `max_slots`
+
+    The limit starts at `min_slots` and is adjusted at most every
+    `adjust_interval` seconds on reserve and release. It is decreased when the
+    loop lag exceeds `max_loop_lag` seconds or the mean task latency of the
+    interval exceeds `latency_tolerance` times the baseline latency.
+    Release and try-reserve may be called from core threads, counters are
+    guarded by a lock and waiters are woken on the loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        min_slots: int,
+        max_slots: int,
+        lag_monitor: LoopLagMonitor,
+        *,
+        max_loop_lag: float = 0.05,
+        latency_tolerance: float = 2.0,
+        adjust_interval: float = 1.0,
+    ) -> None:
+        self._name = name
+        self._min_slots = min_slots
+        self._max_slots = max_slots
+        self._lag_monitor = lag_monitor
+        self._max_loop_lag = max_loop_lag
+        self._latency_tolerance = latency_tolerance
+        self._adjust_interval = adjust_interval
+
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._limit = float(min_slots)
+        self._issued = 0
+        self._in_use = 0
+        # Most slots in use at once since the previous adjustment
+        self._peak_in_use = 0
+        self._latency_total = 0.0
+        self._latency_count = 0
+        self._baseline_latency: float | None = None
+        self._next_adjust = time.monotonic() + adjust_interval
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _try_issue(self) -> _AdaptivePermit | None:
+        with self._lock:
+            self._maybe_adjust()
+            if self._issued >= int(self._limit):
+                return None
+            self._issued += 1
+            return _AdaptivePermit()
+
+    async def reserve_slot(self, ctx: SlotReserveContext) -> SlotPermit:
+        self._loop = asyncio.get_running_loop()
+        self._lag_monitor.start()
+        while (permit := self._try_issue()) is None:
+            waiter = self._loop.create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass a wakeup received right before the cancellation on
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_waiters()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        return permit
+
+    def try_reserve_slot(self, ctx: SlotReserveContext) -> SlotPermit | None:
+        return self._try_issue()
+
+    def mark_slot_used(self, ctx: SlotMarkUsedContext) -> None:
+        if isinstance(ctx.permit, _AdaptivePermit):
+            ctx.permit.used_at = time.monotonic()
+        with self._lock:
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+
+    def release_slot(self, ctx: SlotReleaseContext) -> None:
+        used_at = getattr(ctx.permit, "used_at", None)
+        with self._lock:
+            self._issued -= 1
+            if used_at is not None:
+                self._in_use -= 1
+                self._latency_total += time.monotonic() - used_at
+                self._latency_count += 1
+            self._maybe_adjust()
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake_waiters)
+
+    def _wake_waiters(self) -> None:
+        free = int(self._limit) - self._issued
+        for waiter in list(self._waiters)[: max(free, 0)]:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _maybe_adjust(self) -> None:
+        # Called with the lock held
+        now = time.monotonic()
+        if now < self._next_adjust:
+            return
+        self._next_adjust = now + self._adjust_interval
+
+        latency = None
+        if self._latency_count:
+            latency = self._latency_total / self._latency_count
+            self._latency_total = 0.0
+            self._latency_count = 0
+            if self._baseline_latency is None:
+                self._baseline_latency = latency
+            else:
+                self._baseline_latency = min(
+                    latency,
+                    self._baseline_latency * _BASELINE_DRIFT,
+                )
+
+        peak_in_use, self._peak_in_use = self._peak_in_use, self._in_use
+        lag = self._lag_monitor.lag
+        previous = self._limit
+        if lag > self._max_loop_lag or (
+            latency is not None
+            and self._baseline_latency is not None
+            and latency > self._baseline_latency * self._latency_tolerance
+        ):
+            self._limit = max(self._limit * _DECREASE_FACTOR, self._min_slots)
+        elif peak_in_use >= self._limit * _SATURATION:
+            self._limit = min(
+                self._limit + max(self._limit * _INCREASE_FACTOR, 1),
+                self._max_slots,
+            )
+
+        if int(self._limit) != int(previous):
+            log.debug(
+                f"Adaptive {self._name} slots {int(previous)} -> {int(self._limit)} "
+                f"(loop lag {lag * 1000:.1f}ms, latency "
+                f"{'-' if latency is None else f'{latency * 1000:.1f}ms'})",
+            )
+            if (
+                self._limit > previous
+                and self._loop is not None
+                and not self._loop.is_closed()
+            ):
+                self._loop.call_soon_threadsafe(self._wake_waiters)
@@ -1,3 +1,4 @@
+import inspect
 import logging
 
 from dependency_injector import providers
@@ -28,3 +29,21 @@ async def circular_container_wire_and_init(
         value = dct[key]
         if isinstance(value, providers.Container):
             await circular_container_wire_and_init(value(), wire_modules)
+
+
+async def shutdown_container_resources(container: DeclarativeContainer) -> None:
+    """Shut down the resources of the container and its nested containers"""
+    result = container.shutdown_resources()
+    if inspect.isawaitable(result):
+        await result
+
+
+def offset_bind_address(bind_address: str, offset: int) -> str:
+    """Shift the port of a `host:port` address, e.g. for per-process metrics
+
+    An empty address (endpoint disabled) stays empty.
+    """
+    if not bind_address:
+        return bind_address
+    host, port = bind_address.rsplit(":", 1)
+    return f"{host}:{int(port) + offset}"
@@ -1,3 +1,23 @@
-from .scheduler import SchedulerContainer, SchedulerService
+from .scheduler import (
+    LatencyHistogram,
+    RatePacer,
+    RateProfile,
+    SchedulerContainer,
+    SchedulerService,
+    SchedulerStats,
+    StatsReporter,
+    jsonl_inputs,
+    synthetic_inputs,
+)
 
-__all__ = ["SchedulerContainer", "SchedulerService"]
+__all__ = [
+    "LatencyHistogram",
+    "RatePacer",
+    "RateProfile",
+    "SchedulerContainer",
+    "SchedulerService",
+    "SchedulerStats",
+    "StatsReporter",
+    "jsonl_inputs",
+    "synthetic_inputs",
+]
@@ -1,4 +1,20 @@
 from .container import SchedulerContainer
+from .rate import RatePacer, RateProfile
 from .service import SchedulerService
+from .sources import jsonl_inputs, synthetic_inputs
+from .stats import LatencyHistogram, SchedulerStats, StatsAggregator, StatsReporter
+from .targets import SchedulerTarget
 
-__all__ = ["SchedulerContainer", "SchedulerService"]
+__all__ = [
+    "LatencyHistogram",
+    "RatePacer",
+    "RateProfile",
+    "SchedulerContainer",
+    "SchedulerService",
+    "SchedulerStats",
+    "SchedulerTarget",
+    "StatsAggregator",
+    "StatsReporter",
+    "jsonl_inputs",
+    "synthetic_inputs",
+]
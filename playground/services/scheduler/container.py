@@ -3,15 +3,92 @@ from dependency_injector.containers import (  # pylint: disable=no-name-in-modul
     DeclarativeContainer,
 )
 from pydantic_settings import BaseSettings
+from temporalio.common import (
+    SearchAttributeKey,
+    SearchAttributePair,
+    TypedSearchAttributes,
+    WorkflowIDReusePolicy,
+)
+
+from infra.instrumentation.monitor import StageTimings
+from infra.temporalio_utils.container import (
+    TemporalContainer,
+    TemporalService,
+    get_runtime,
+)
+from infra.temporalio_utils.ids import WorkflowIdGenerator, workflow_id_generator
+from infra.temporalio_utils.service import (
+    STREAM_ID_PREFIX,
+    WORKFLOW_ID_PREFIX,
+    StartOptions,
+)
+
+from .rate import RateProfile
+from .service import SchedulerService, StatsCallback
+
+
+def get_rate_profile(app_settings: BaseSettings) -> RateProfile | None:
+    """Rate profile of the open-loop mode, None keeps the closed loop"""
+    profile = RateProfile(
+        kind=app_settings.scheduler_rate_profile,  # type: ignore
+        rate=app_settings.scheduler_rate,  # type: ignore
+        max_rate=app_settings.scheduler_rate_max,  # type: ignore
+        step=app_settings.scheduler_rate_step,  # type: ignore
+        step_interval=app_settings.scheduler_rate_step_interval,  # type: ignore
+        ramp_duration=app_settings.scheduler_rate_ramp_duration,  # type: ignore
+        spike_start=app_settings.scheduler_rate_spike_start,  # type: ignore
+        spike_duration=app_settings.scheduler_rate_spike_duration,  # type: ignore
+        spike_period=app_settings.scheduler_rate_spike_period,  # type: ignore
+    )
+    return profile if profile.open_loop else None
+
+
+def _get_run_scope(app_settings: BaseSettings, name: str) -> str:
+    """Run ID plus process and target, unique per SchedulerService of a run"""
+    # Sequence indexes and stream pools restart in every process and target,
+    # they get their own part of the ID prefix so IDs of one run never collide
+    scope = app_settings.scheduler_run_id  # type: ignore
+    if app_settings.scheduler_batch_shard_count > 1:  # type: ignore
+        scope += f"-p{app_settings.scheduler_batch_shard_index}"  # type: ignore
+    if name:
+        scope += f"-{name.replace('/', '-')}"
+    return scope
+
 
-from infra.temporalio_utils.container import TemporalContainer, TemporalService
+def _get_workflow_ids(app_settings: BaseSettings, name: str) -> WorkflowIdGenerator:
+    scheme = app_settings.scheduler_workflow_id_scheme  # type: ignore
+    if scheme in {"uuid7", "uuid4"}:
+        return workflow_id_generator(scheme, WORKFLOW_ID_PREFIX)
+    prefix = f"{WORKFLOW_ID_PREFIX}-{_get_run_scope(app_settings, name)}"
+    return workflow_id_generator(scheme, prefix)
 
-from .service import SchedulerService
+
+def _get_start_options(app_settings: BaseSettings) -> StartOptions:
+    run_id = app_settings.scheduler_run_id  # type: ignore
+    search_attribute = app_settings.scheduler_run_id_search_attribute  # type: ignore
+    search_attributes = None
+    if search_attribute:
+        key = SearchAttributeKey.for_keyword(search_attribute)
+        search_attributes = TypedSearchAttributes([SearchAttributePair(key, run_id)])
+    # Reproduced IDs of a retried deterministic run must not start twice
+    id_reuse_policy = (
+        WorkflowIDReusePolicy.REJECT_DUPLICATE
+        if app_settings.scheduler_workflow_id_scheme == "deterministic"  # type: ignore
+        else WorkflowIDReusePolicy.ALLOW_DUPLICATE
+    )
+    return StartOptions(
+        memo={"run_id": run_id} if app_settings.scheduler_run_id_memo else None,  # type: ignore
+        search_attributes=search_attributes,
+        id_reuse_policy=id_reuse_policy,
+    )
 
 
 def _get_scheduler_service(
     temporal_service: "TemporalService",
     app_settings: BaseSettings,
+    stats_callback: StatsCallback | None = None,
+    stage_timings: StageTimings | None = None,
+    name: str = "",
 ) -> SchedulerService:
     return SchedulerService(
         temporal_service=temporal_service,
@@ -19,6 +96,25 @@ def _get_scheduler_service(
         namespace=app_settings.scheduler_namespace,
         concurrency=app_settings.scheduler_concurrency,
         report_interval=app_settings.scheduler_report_interval,  # type: ignore
+        start_mode=app_settings.scheduler_start_mode,  # type: ignore
+        track_completion=app_settings.scheduler_track_completion,  # type: ignore
+        rate_profile=get_rate_profile(app_settings),
+        rate_burst=app_settings.scheduler_rate_burst,  # type: ignore
+        stats_callback=stats_callback,
+        echo_strategy=app_settings.scheduler_echo_strategy,  # type: ignore
+        stream_pool_size=app_settings.scheduler_stream_pool_size,  # type: ignore
+        stream_max_history_length=app_settings.scheduler_stream_max_history_length,  # type: ignore
+        stream_max_history_size=app_settings.scheduler_stream_max_history_size,  # type: ignore
+        update_with_start=app_settings.scheduler_update_with_start,  # type: ignore
+        drain_timeout=app_settings.scheduler_drain_timeout,  # type: ignore
+        terminate_abandoned=app_settings.scheduler_terminate_abandoned,  # type: ignore
+        stage_timings=stage_timings,
+        metric_meter=get_runtime().metric_meter,
+        name=name,
+        run_id=app_settings.scheduler_run_id,  # type: ignore
+        workflow_ids=_get_workflow_ids(app_settings, name),
+        start_options=_get_start_options(app_settings),
+        stream_id_prefix=f"{STREAM_ID_PREFIX}-{_get_run_scope(app_settings, name)}",
     )
 
 
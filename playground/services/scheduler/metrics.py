@@ -0,0 +1,82 @@
+"""Scheduler metrics on the SDK runtime meter
+
+Recorded through `Runtime.metric_meter`, so they are exported with the core
+SDK metrics on the same Prometheus endpoint (TEMPORAL_METRICS_BIND_ADDRESS)
+or metric buffer, and can be graphed next to the server metrics.
+"""
+
+from temporalio.common import MetricMeter
+
+# Histogram names, bucket bounds are set in infra get_runtime()
+QUEUE_WAIT_LATENCY = "scheduler_queue_wait_latency"
+START_LATENCY = "scheduler_start_latency"
+E2E_LATENCY = "scheduler_e2e_latency"
+
+
+class SchedulerMetrics:
+    """Counters, in-flight gauge and latency histograms (ms) of one scheduler
+
+    Every metric carries the namespace, task queue and start mode attributes.
+    """
+
+    def __init__(
+        self,
+        meter: MetricMeter,
+        namespace: str,
+        task_queue: str,
+        start_mode: str,
+    ) -> None:
+        meter = meter.with_additional_attributes(
+            {
+                "namespace": namespace,
+                "task_queue": task_queue,
+                "start_mode": start_mode,
+            },
+        )
+        self._starts = meter.create_counter(
+            "scheduler_workflow_starts",
+            "Workflows started (signals/updates sent in stream modes)",
+        )
+        self._failures = meter.create_counter(
+            "scheduler_workflow_failures",
+            "Failed starts and workflow results by stage and error type",
+        )
+        self._in_flight = meter.create_gauge(
+            "scheduler_in_flight",
+            "Starts holding a concurrency slot",
+        )
+        self._queue_wait = meter.create_histogram_float(
+            QUEUE_WAIT_LATENCY,
+            "Wait of a queued input for a free worker",
+            "ms",
+        )
+        self._start_latency = meter.create_histogram_float(
+            START_LATENCY,
+            "Start RPC latency",
+            "ms",
+        )
+        self._e2e_latency = meter.create_histogram_float(
+            E2E_LATENCY,
+            "Start to workflow result (or update result) latency",
+            "ms",
+        )
+
+    def record_queue_wait(self, seconds: float) -> None:
+        self._queue_wait.record(seconds * 1000)
+
+    def record_start(self, seconds: float) -> None:
+        self._starts.add(1)
+        self._start_latency.record(seconds * 1000)
+
+    def record_e2e(self, seconds: float) -> None:
+        self._e2e_latency.record(seconds * 1000)
+
+    def record_failure(self, stage: str, error: BaseException) -> None:
+        """Count a failure at the "start" or "result" stage"""
+        self._failures.add(
+            1,
+            {"stage": stage, "error_type": type(error).__name__},
+        )
+
+    def set_in_flight(self, count: int) -> None:
+        self._in_flight.set(count)
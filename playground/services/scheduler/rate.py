@@ -0,0 +1,141 @@
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Literal
+
+RateProfileKind = Literal["constant", "step", "ramp", "spike"]
+
+# Longest pacer sleep before the rate of the profile is evaluated again, also
+# the sleep while the profile asks for zero rate
+_IDLE_SLEEP = 0.05
+
+
+@dataclass(frozen=True)
+class RateProfile:
+    """Target start rate (workflows per second) as a function of elapsed time
+
+    - constant: `rate` all the time
+    - step: `rate` + `step` every `step_interval` seconds, capped by `max_rate`
+    - ramp: linear from `rate` to `max_rate` over `ramp_duration`, then hold
+    - spike: `rate`, switching to `max_rate` for `spike_duration` seconds
+      starting at `spike_start` (repeated every `spike_period` if > 0)
+    """
+
+    kind: RateProfileKind = "constant"
+    rate: float = 0
+    max_rate: float = 0
+    step: float = 0
+    step_interval: float = 60
+    ramp_duration: float = 60
+    spike_start: float = 30
+    spike_duration: float = 10
+    spike_period: float = 0
+
+    def rate_at(self, elapsed: float) -> float:
+        if self.kind == "step":
+            steps = math.floor(elapsed / self.step_interval)
+            rate = self.rate + self.step * steps
+            return min(rate, self.max_rate) if self.max_rate > 0 else rate
+        if self.kind == "ramp":
+            if elapsed >= self.ramp_duration:
+                return self.max_rate
+            return self.rate + (self.max_rate - self.rate) * (
+                elapsed / self.ramp_duration
+            )
+        if self.kind == "spike":
+            offset = elapsed - self.spike_start
+            if offset >= 0 and self.spike_period > 0:
+                offset %= self.spike_period
+            if 0 <= offset < self.spike_duration:
+                return self.max_rate
+        return self.rate
+
+    @property
+    def open_loop(self) -> bool:
+        """Whether the profile asks for a non-zero rate at any time
+
+        A step, ramp or spike may start from `rate` = 0.
+        """
+        if self.kind == "constant":
+            return self.rate > 0
+        if self.kind == "step":
+            return self.rate > 0 or self.step > 0
+        return self.rate > 0 or self.max_rate > 0
+
+    def __str__(self) -> str:
+        """Short description of the profile for log lines"""
+        if self.kind == "constant":
+            return f"constant {self.rate:g} wf/s"
+        if self.kind == "step":
+            return (
+                f"step {self.rate:g} +{self.step:g} wf/s every {self.step_interval:g}s "
+                f"(max {self.max_rate:g})"
+            )
+        if self.kind == "ramp":
+            return (
+                f"ramp {self.rate:g} -> {self.max_rate:g} wf/s "
+                f"over {self.ramp_duration:g}s"
+            )
+        return (
+            f"spike {self.rate:g} -> {self.max_rate:g} wf/s at {self.spike_start:g}s "
+            f"for {self.spike_duration:g}s (period {self.spike_period:g}s)"
+        )
+
+
+class RatePacer:
+    """Open-loop send-slot scheduler on the monotonic clock
+
+    Send slots are laid out at 1/rate intervals from a fixed start time rather
+    than by sleeping a fixed delay after each send, so event loop lag does not
+    accumulate as drift: after a stall all overdue slots are released at once.
+    Like a token bucket, at most `max_burst` overdue slots are released; the
+    rest are counted in `missed_slots`. `scheduled_slots` counts every slot the
+    profile asked for, released or missed.
+    """
+
+    def __init__(self, profile: RateProfile, max_burst: int = 100) -> None:
+        self._profile = profile
+        self._max_burst = max(1, max_burst)
+        self._start = time.monotonic()
+        # Time of the last released slot, None = the next slot is due now
+        self._last_slot: float | None = None
+        self.scheduled_slots = 0
+        self.missed_slots = 0
+
+    def start(self) -> None:
+        self._start = time.monotonic()
+        self._last_slot = None
+        self.scheduled_slots = 0
+        self.missed_slots = 0
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self._start
+
+    def target_rate(self) -> float:
+        return self._profile.rate_at(self.elapsed())
+
+    async def wait(self) -> int:
+        """Sleep until the next send slot is due and return the number of due slots"""
+        while True:
+            now = time.monotonic()
+            rate = self._profile.rate_at(now - self._start)
+            if rate <= 0:
+                await asyncio.sleep(_IDLE_SLEEP)
+                self._last_slot = None
+                continue
+            # The interval follows the current rate, so a rising profile (e.g.
+            # a ramp from 0) brings the next slot forward while sleeping
+            interval = 1 / rate
+            next_slot = now if self._last_slot is None else self._last_slot + interval
+            if now < next_slot:
+                await asyncio.sleep(min(next_slot - now, _IDLE_SLEEP))
+                continue
+
+            due = int((now - next_slot) / interval) + 1
+            self._last_slot = next_slot + (due - 1) * interval
+            self.scheduled_slots += due
+            if due > self._max_burst:
+                self.missed_slots += due - self._max_burst
+                due = self._max_burst
+            return due
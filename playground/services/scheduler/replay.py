@@ -0,0 +1,182 @@
+"""Replay of recorded workload traces
+
+A trace is a JSONL file, one workflow start per line in time order:
+
+    {"ts": 1718000000.125, "namespace": "ns1", "task_queue": "a", "size": 512,
+     "count": 3, "strategy": "parallel"}
+
+`ts` is epoch seconds or an ISO 8601 string. `message` may be given instead of
+`size` (payload bytes). All fields except `ts` are optional, missing `count`
+(a positive integer) and `strategy` fall back to the scheduler settings. The
+file is memory-mapped and parsed line by line, so traces larger than RAM are
+streamed from the page cache.
+"""
+
+import asyncio
+import json
+import logging
+import mmap
+from collections.abc import AsyncIterator, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, get_args
+
+from tasks.shared import EchoStrategy, EchoWorkflowInput
+
+log = logging.getLogger(__name__)
+
+# Records replayed without sleeping before the loop gets a chance to run
+_MAX_BURST = 100
+# Mapped bytes read before the pages behind the cursor are released
+_RELEASE_BYTES = 64 * 1024 * 1024
+_STRATEGIES: tuple[str, ...] = get_args(EchoStrategy)
+
+
+@dataclass(frozen=True, slots=True)
+class TraceRecord:
+    timestamp: float
+    namespace: str | None = None
+    task_queue: str | None = None
+    message: str | None = None
+    size: int = 0
+    count: int | None = None
+    strategy: EchoStrategy | None = None
+
+
+def _timestamp(value: float | str) -> float:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+
+def _integer(data: dict[str, Any], key: str, minimum: int) -> int | None:
+    """Integral JSON number `key` of at least `minimum`, None when missing"""
+    value = data.get(key)
+    if value is None:
+        return None
+    if (
+        isinstance(value, bool)
+        or not isinstance(value, int | float)
+        or (isinstance(value, float) and not value.is_integer())
+        or value < minimum
+    ):
+        raise ValueError(f"{key} must be an integer >= {minimum}, got {value!r}")
+    return int(value)
+
+
+def _string(data: dict[str, Any], key: str) -> str | None:
+    value = data.get(key)
+    if value is not None and not isinstance(value, str):
+        raise TypeError(f"{key} must be a string, got {value!r}")
+    return value
+
+
+def _parse_record(line: bytes) -> TraceRecord:
+    """Parse and validate a trace line, a record always makes a valid input"""
+    data = json.loads(line)
+    if not isinstance(data, dict):
+        raise TypeError(f"record must be a JSON object, got {data!r}")
+    strategy = data.get("strategy")
+    if strategy is not None and strategy not in _STRATEGIES:
+        raise ValueError(f"unknown strategy {strategy!r}")
+    return TraceRecord(
+        timestamp=_timestamp(data["ts"]),
+        namespace=_string(data, "namespace"),
+        task_queue=_string(data, "task_queue"),
+        message=_string(data, "message"),
+        size=_integer(data, "size", 0) or 0,
+        count=_integer(data, "count", 1),
+        strategy=strategy,
+    )
+
+
+def read_trace(
+    path: str | Path,
+    shard_index: int = 0,
+    shard_count: int = 1,
+) -> Iterator[TraceRecord]:
+    """Stream records of a trace file through a read-only memory map
+
+    With `shard_count` > 1 only every shard_count-th line starting at
+    `shard_index` is used, so several processes can split one trace.
+    Invalid lines are logged and skipped.
+    """
+    with open(path, "rb") as file:
+        # mmap of an empty file fails
+        if not file.seek(0, 2):
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            released = 0
+            for line_number, line in enumerate(iter(mapped.readline, b""), start=1):
+                if hasattr(mmap, "MADV_DONTNEED") and (
+                    mapped.tell() - released >= _RELEASE_BYTES
+                ):
+                    # Read pages stay resident otherwise, RSS would grow to
+                    # the trace size
+                    position = mapped.tell() // mmap.PAGESIZE * mmap.PAGESIZE
+                    mapped.madvise(mmap.MADV_DONTNEED, released, position - released)
+                    released = position
+                if (line_number - 1) % shard_count != shard_index or not line.strip():
+                    continue
+                try:
+                    yield _parse_record(line)
+                except (ValueError, TypeError, KeyError) as e:
+                    log.warning(f"Skipping invalid record at {path}:{line_number}: {e}")
+
+
+def trace_start(path: str | Path) -> float | None:
+    """Timestamp of the first valid record, the time origin of a replay"""
+    return next((record.timestamp for record in read_trace(path)), None)
+
+
+@lru_cache(maxsize=256)
+def _payload(size: int) -> str:
+    return "x" * size
+
+
+async def replay_inputs(
+    records: Iterable[TraceRecord],
+    start: float,
+    speed: float = 1.0,
+    *,
+    count: int = 1,
+    strategy: EchoStrategy = "sequential",
+    namespace: str | None = None,
+    task_queue: str | None = None,
+    default_target: tuple[str, str] | None = None,
+) -> AsyncIterator[EchoWorkflowInput]:
+    """Yield workflow inputs of `records` at their original inter-arrival times
+
+    A record is due `(timestamp - start) / speed` seconds after the replay
+    started, late records are yielded at once. With `namespace` and
+    `task_queue` only records of that target are replayed, a missing
+    namespace or task queue of a record is taken from `default_target`.
+    """
+    default_namespace, default_task_queue = default_target or (None, None)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    burst = 0
+    for record in records:
+        if (namespace and (record.namespace or default_namespace) != namespace) or (
+            task_queue and (record.task_queue or default_task_queue) != task_queue
+        ):
+            continue
+        delay = started + (record.timestamp - start) / speed - loop.time()
+        if delay > 0:
+            burst = 0
+            await asyncio.sleep(delay)
+        elif (burst := burst + 1) >= _MAX_BURST:
+            # Catching up, keep workers and RPC callbacks running meanwhile
+            burst = 0
+            await asyncio.sleep(0)
+        yield EchoWorkflowInput(
+            message=record.message
+            if record.message is not None
+            else _payload(record.size),
+            count=record.count if record.count is not None else count,
+            strategy=record.strategy or strategy,
+        )
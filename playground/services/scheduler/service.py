@@ -1,13 +1,63 @@
 import asyncio
+import itertools
 import logging
 import time
-from typing import TYPE_CHECKING
+from collections.abc import AsyncIterable, Callable, Iterable
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any, Literal
+
+from tasks.shared import EchoStrategy, EchoWorkflowInput
+from temporalio.common import MetricMeter
+from temporalio.exceptions import WorkflowAlreadyStartedError
+
+from infra.instrumentation.monitor import StageTimings, measure
+from infra.logs import PER_ITEM
+from infra.temporalio_utils.ids import (
+    WorkflowIdGenerator,
+    new_run_id,
+    workflow_id_generator,
+)
+from infra.temporalio_utils.service import (
+    STREAM_ID_PREFIX,
+    WORKFLOW_ID_PREFIX,
+    StartOptions,
+)
+
+from .metrics import SchedulerMetrics
+from .rate import RatePacer, RateProfile
+from .sources import synthetic_inputs
+from .stats import LatencyHistogram, SchedulerStats, StatsReporter
 
 if TYPE_CHECKING:
-    from infra.temporalio_utils.service import TemporalService
+    from temporalio.client import WorkflowHandle
+
+    from infra.temporalio_utils.service import TemporalService, WorkflowStartResult
 
 log = logging.getLogger(__name__)
 
+# "execute" - a concurrency slot is held until the workflow completes (closed loop)
+# "start" - a concurrency slot is held only for the start RPC (fire-and-forget)
+# "signal" - messages are sent by signal-with-start to a fixed pool of
+#            long-running EchoStreamWorkflows instead of one workflow each
+# "update" - request-response through the "echo_sync" update of the same pool,
+#            a slot is held until the update result arrives
+StartMode = Literal["execute", "start", "signal", "update"]
+
+StatsCallback = Callable[[SchedulerStats], None]
+
+# Abandoned workflow IDs listed in the final report
+_ABANDONED_IDS_SHOWN = 10
+
+# Queued workflow input and the perf_counter() time it was offered
+_Queued = tuple[EchoWorkflowInput, float]
+
+
+class _NamedLog(logging.LoggerAdapter):
+    """Prefixes messages with the scheduler name, keeps `extra` of the call"""
+
+    def process(self, msg: Any, kwargs: Any) -> tuple[Any, Any]:
+        return f"[{self.extra['name']}] {msg}", kwargs  # type: ignore[index]
+
 
 class SchedulerService:
     def __init__(
@@ -17,89 +67,527 @@ class SchedulerService:
         namespace: str,
         concurrency: int = 10,
         report_interval: int = 10,
+        *,
+        start_mode: StartMode = "execute",
+        track_completion: bool = False,
+        rate_profile: RateProfile | None = None,
+        rate_burst: int = 100,
+        stats_callback: StatsCallback | None = None,
+        echo_strategy: EchoStrategy = "sequential",
+        stream_pool_size: int = 10,
+        stream_max_history_length: int = 10_000,
+        stream_max_history_size: int = 10 * 1024 * 1024,
+        update_with_start: bool = False,
+        stage_timings: StageTimings | None = None,
+        metric_meter: MetricMeter | None = None,
+        drain_timeout: float = 30,
+        terminate_abandoned: bool = False,
+        name: str = "",
+        run_id: str = "",
+        workflow_ids: WorkflowIdGenerator | None = None,
+        start_options: StartOptions | None = None,
+        stream_id_prefix: str = "",
     ) -> None:
+        # Report lines are prefixed with `name` when several schedulers share
+        # a process, e.g. one per target of a weighted namespace/queue mix
+        self._log: logging.Logger | _NamedLog = (
+            _NamedLog(log, {"name": name}) if name else log
+        )
         self._temporal_service = temporal_service
         self._task_queue = task_queue
         self._namespace = namespace
         self._concurrency = concurrency
         self._report_interval = report_interval
+        self._start_mode = start_mode
+        self._track_completion = track_completion
+        self._echo_strategy = echo_strategy
+        # Workflow IDs by sequence index of the start within the run, by
+        # default `echo-workflow-{run_id}-{index}`
+        self.run_id = run_id or new_run_id()
+        self._workflow_ids = workflow_ids or workflow_id_generator(
+            "sequential",
+            f"{WORKFLOW_ID_PREFIX}-{self.run_id}",
+        )
+        self._next_index = itertools.count().__next__
+        # Memo and search attributes apply to stream workflows too
+        self._start_options = start_options or StartOptions()
+        # EchoStreamWorkflow pool of the "signal" and "update" modes, messages
+        # round-robin, by default `echo-stream-{run_id}-{i}`
+        stream_id_prefix = stream_id_prefix or f"{STREAM_ID_PREFIX}-{self.run_id}"
+        self._stream_ids = [f"{stream_id_prefix}-{i}" for i in range(stream_pool_size)]
+        self._next_stream_id = itertools.cycle(self._stream_ids).__next__
+        self._stream_max_history_length = stream_max_history_length
+        self._stream_max_history_size = stream_max_history_size
+        # "update" mode: update-with-start for every message or only until a
+        # stream workflow is known to run, plain updates afterwards
+        self._update_with_start = update_with_start
+        self._running_streams: set[str] = set()
+        # Open-loop pacing, None means closed loop driven by concurrency only
+        self._pacer = RatePacer(rate_profile, rate_burst) if rate_profile else None
+        self._rate_profile = rate_profile
+        # Receives every stats snapshot, e.g. to aggregate several processes
+        self._stats_callback = stats_callback
+        # Per-stage durations of _start_single_workflow, None = not measured
+        self._stage_timings = stage_timings
+        # Exported with the SDK metrics of the runtime, no-op without a meter
+        self._metrics = SchedulerMetrics(
+            metric_meter or MetricMeter.noop,
+            namespace=namespace,
+            task_queue=task_queue,
+            start_mode=start_mode,
+        )
+        # Shutdown: seconds in-flight work may take after stop() before it is
+        # abandoned, and whether abandoned workflows are terminated
+        self._drain_timeout = drain_timeout
+        self._terminate_abandoned = terminate_abandoned
 
         # Statistics
         self._total_workflows = 0
-        self._last_completed = 0
-        self._last_check = time.time()
+        self._completed_workflows = 0
+        self._failed_workflows = 0
         self._start_time = time.time()
         self._running_tasks = 0
+        self._offered_workflows = 0
+        # Inputs of an external source (trace replay) not taken by a full queue
+        self._missed_inputs = 0
+        # Workflow history at completion, summed over completed workflows
+        self._history_events = 0
+        self._history_bytes = 0
+        self._history_samples = 0
+        # Start, signal and update requests in flight and the IDs of the
+        # workflows whose result is awaited, by awaiting task
+        self._requests_in_flight = 0
+        self._awaiting: dict[asyncio.Task[Any], str] = {}
+        # Work cut off by the drain deadline
+        self._abandoned_requests = 0
+        self._abandoned_workflows: list[str] = []
+        self._terminated_workflows = 0
+        # Starts rejected with WorkflowAlreadyStartedError
+        self._duplicate_starts = 0
+        # Size of the current batch, None when running infinitely or unknown
+        self._batch_total: int | None = None
+        self._reporter = StatsReporter(open_loop=self._pacer is not None)
+
+        # Latency histograms for the current report interval
+        self._start_latency = LatencyHistogram()
+        self._e2e_latency = LatencyHistogram()
 
         # Control
-        self._semaphore = asyncio.Semaphore(concurrency)
-        self._should_stop = False
+        # Bounded hand-off between the producer and `concurrency` workers,
+        # inputs carry the time they were offered to measure the queue wait
+        self._queue: asyncio.Queue[_Queued | None] = asyncio.Queue(
+            maxsize=concurrency,
+        )
+        self._stop_event = asyncio.Event()
+        # Loop time by which draining ends, set by the first drain after stop()
+        self._drain_deadline: float | None = None
+        self._completion_tasks: set[asyncio.Task[None]] = set()
 
-    async def _start_single_workflow(self, message: str, count: int = 1) -> None:
-        """Start a single workflow with semaphore control"""
-        async with self._semaphore:
-            self._running_tasks += 1
-            try:
-                workflow_id = await self._temporal_service.execute_echo_workflow(
-                    namespace=self._namespace,
-                    task_queue=self._task_queue,
-                    message=message,
-                    count=count,
+    def stop(self) -> None:
+        """Stop producing new work and drain in-flight work
+
+        Safe to call repeatedly, e.g. from a signal handler of the loop.
+        """
+        if not self._stop_event.is_set():
+            self._log.info("Stopping scheduler...")
+            self._stop_event.set()
+
+    async def _await_completion(
+        self,
+        handle: "WorkflowHandle[Any, Any]",
+        started_at: float,
+    ) -> None:
+        """Wait for workflow result and record end-to-end latency"""
+        task = asyncio.current_task()
+        assert task is not None
+        self._awaiting[task] = handle.id
+        try:
+            result = await handle.result()
+            self._completed_workflows += 1
+            latency = time.perf_counter() - started_at
+            self._e2e_latency.record(latency)
+            self._metrics.record_e2e(latency)
+            if result is not None:
+                self._history_events += result.history_length
+                self._history_bytes += result.history_size
+                self._history_samples += 1
+        except Exception as e:
+            self._failed_workflows += 1
+            self._metrics.record_failure("result", e)
+            self._log.error("Workflow %s failed: %s", handle.id, e, extra=PER_ITEM)
+        finally:
+            del self._awaiting[task]
+
+    def _spawn_completion_tracker(
+        self,
+        handle: "WorkflowHandle[Any, Any]",
+        started_at: float,
+    ) -> None:
+        """Track workflow completion outside of the start slots"""
+        task = asyncio.create_task(self._await_completion(handle, started_at))
+        self._completion_tasks.add(task)
+        task.add_done_callback(self._completion_tasks.discard)
+
+    async def _wait_completion_trackers(self) -> None:
+        if self._completion_tasks:
+            self._log.info(
+                f"Waiting for {len(self._completion_tasks)} tracked workflows "
+                f"to complete...",
+            )
+            await self._drain(self._completion_tasks)
+
+    async def _drain(self, tasks: Iterable[asyncio.Task[Any]]) -> None:
+        """Wait for `tasks`, bounded by the drain deadline once stop() is called
+
+        Tasks still running at the deadline are cancelled, the requests in
+        flight and the workflows awaited by these tasks are recorded as
+        abandoned. Workflows of other tasks, e.g. completion trackers while
+        workers drain, are left to their own drain.
+        """
+        pending = {task for task in tasks if not task.done()}
+        stopped = asyncio.create_task(self._stop_event.wait())
+        try:
+            while pending and not self._stop_event.is_set():
+                _, pending = await asyncio.wait(
+                    pending | {stopped},
+                    return_when=asyncio.FIRST_COMPLETED,
                 )
-                self._total_workflows += 1
-                log.debug(f"Started workflow: {workflow_id}")
+                pending.discard(stopped)
+        finally:
+            stopped.cancel()
+        if not pending:
+            return
+
+        loop = asyncio.get_running_loop()
+        if self._drain_deadline is None:
+            self._drain_deadline = loop.time() + self._drain_timeout
+        timeout = max(self._drain_deadline - loop.time(), 0)
+        self._log.info(f"Draining {len(pending)} tasks for up to {timeout:.1f}s...")
+        _, pending = await asyncio.wait(pending, timeout=timeout)
+        if not pending:
+            return
+
+        # Recorded before cancelling, cancelled tasks clear their state
+        self._abandoned_requests += self._requests_in_flight
+        abandoned = sorted(
+            self._awaiting[task] for task in pending if task in self._awaiting
+        )
+        self._abandoned_workflows.extend(abandoned)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if abandoned and self._terminate_abandoned:
+            self._log.info(f"Terminating {len(abandoned)} abandoned workflows...")
+            terminated = await self._temporal_service.terminate_workflows(
+                namespace=self._namespace,
+                workflow_ids=abandoned,
+                max_in_flight=self._concurrency,
+            )
+            self._terminated_workflows += terminated
 
-            except Exception as e:
-                log.error(f"Error starting workflow: {e}")
+    async def _start_single_workflow(
+        self,
+        workflow_input: EchoWorkflowInput,
+        index: int,
+    ) -> None:
+        """Start a single workflow, called by one of `concurrency` workers
+
+        `index` is the position of the input in the run, it determines the
+        workflow ID in the "start" and "execute" modes.
+        """
+        self._running_tasks += 1
+        self._metrics.set_in_flight(self._running_tasks)
+        try:
+            started_at = time.perf_counter()
+            handle: WorkflowHandle[Any, Any] | None = None
+            self._requests_in_flight += 1
+            try:
+                if self._start_mode == "update":
+                    await self._update_stream(workflow_input)
+                elif self._start_mode == "signal":
+                    handle = await self._signal_stream(workflow_input)
+                else:
+                    handle = await self._temporal_service.start_echo_workflow(
+                        namespace=self._namespace,
+                        task_queue=self._task_queue,
+                        message=workflow_input.message,
+                        count=workflow_input.count,
+                        strategy=workflow_input.strategy,
+                        timings=self._stage_timings,
+                        workflow_id=self._workflow_ids(index),
+                        options=self._start_options,
+                    )
             finally:
-                self._running_tasks -= 1
+                self._requests_in_flight -= 1
+            latency = time.perf_counter() - started_at
+            if handle is None:
+                # "update" mode, the result arrived with the update
+                self._total_workflows += 1
+                self._completed_workflows += 1
+                self._e2e_latency.record(latency)
+                self._metrics.record_start(latency)
+                self._metrics.record_e2e(latency)
+                return
+            self._start_latency.record(latency)
+            self._metrics.record_start(latency)
+            self._total_workflows += 1
+            self._log.debug("Started workflow: %s", handle.id, extra=PER_ITEM)
+
+            if self._start_mode == "execute":
+                with measure(self._stage_timings, "result_wait"):
+                    await self._await_completion(handle, started_at)
+            elif self._track_completion and self._start_mode == "start":
+                self._spawn_completion_tracker(handle, started_at)
+
+        except WorkflowAlreadyStartedError as e:
+            self._duplicate_starts += 1
+            self._log.debug("Skipping duplicate start: %s", e, extra=PER_ITEM)
+        except Exception as e:
+            self._failed_workflows += 1
+            self._metrics.record_failure("start", e)
+            self._log.error("Error starting workflow: %s", e, extra=PER_ITEM)
+        finally:
+            self._running_tasks -= 1
+            self._metrics.set_in_flight(self._running_tasks)
+
+    async def _signal_stream(
+        self,
+        workflow_input: EchoWorkflowInput,
+    ) -> "WorkflowHandle[Any, Any]":
+        with measure(self._stage_timings, "signal_rpc"):
+            return await self._temporal_service.signal_with_start_echo_stream(
+                namespace=self._namespace,
+                task_queue=self._task_queue,
+                workflow_id=self._next_stream_id(),
+                message=workflow_input.message,
+                max_history_length=self._stream_max_history_length,
+                max_history_size=self._stream_max_history_size,
+                options=self._start_options,
+            )
+
+    async def _update_stream(self, workflow_input: EchoWorkflowInput) -> None:
+        workflow_id = self._next_stream_id()
+        with_start = self._update_with_start or workflow_id not in self._running_streams
+        with measure(self._stage_timings, "update_rpc"):
+            await self._temporal_service.execute_echo_update(
+                namespace=self._namespace,
+                task_queue=self._task_queue,
+                workflow_id=workflow_id,
+                message=workflow_input.message,
+                count=workflow_input.count,
+                strategy=workflow_input.strategy,
+                with_start=with_start,
+                max_history_length=self._stream_max_history_length,
+                max_history_size=self._stream_max_history_size,
+                options=self._start_options,
+            )
+        self._running_streams.add(workflow_id)
+
+    async def _stop_streams(self) -> None:
+        """Let the EchoStreamWorkflow pool drain and complete"""
+        if self._start_mode not in {"signal", "update"} or not self._total_workflows:
+            return
+        self._log.info(f"Stopping {len(self._stream_ids)} stream workflows...")
+        await asyncio.gather(
+            *(
+                self._temporal_service.stop_echo_stream(self._namespace, workflow_id)
+                for workflow_id in self._stream_ids
+            ),
+            return_exceptions=True,
+        )
 
     async def _workflow_starter_loop(self, message: str, count: int = 1) -> None:
-        """Infinite loop that starts workflows"""
+        """Infinite loop that produces workflow inputs into the bounded queue
+
+        `put` blocks while all workers are busy and the queue is full, so the
+        producer never runs ahead of the available concurrency slots.
+        """
         workflow_counter = 1
 
-        while not self._should_stop:
+        while not self._stop_event.is_set():
             try:
-                # Create task for starting workflow (non-blocking)
-                asyncio.create_task(
-                    self._start_single_workflow(
-                        f"{message} #{workflow_counter}",
-                        count,
-                    ),
+                workflow_input = EchoWorkflowInput(
+                    message=f"{message} #{workflow_counter}",
+                    count=count,
+                    strategy=self._echo_strategy,
                 )
+                await self._queue.put((workflow_input, time.perf_counter()))
                 workflow_counter += 1
 
-                # Small delay to prevent overwhelming
-                await asyncio.sleep(0.01)
+            except Exception as e:
+                self._log.error(f"Error in workflow starter loop: {e}")
+                await asyncio.sleep(1)
+
+    async def _paced_starter_loop(self, message: str, count: int = 1) -> None:
+        """Open-loop producer that offers workflow inputs at the target rate
+
+        Send slots never wait for a free worker: when the queue is full the
+        slot is counted as missed, which keeps coordinated omission visible.
+        """
+        assert self._pacer is not None
+        workflow_counter = 1
+        self._pacer.start()
+
+        while not self._stop_event.is_set():
+            try:
+                due = await self._pacer.wait()
+                for _ in range(due):
+                    try:
+                        workflow_input = EchoWorkflowInput(
+                            message=f"{message} #{workflow_counter}",
+                            count=count,
+                            strategy=self._echo_strategy,
+                        )
+                        self._queue.put_nowait((workflow_input, time.perf_counter()))
+                    except asyncio.QueueFull:
+                        self._pacer.missed_slots += 1
+                    else:
+                        workflow_counter += 1
+                        self._offered_workflows += 1
 
             except Exception as e:
-                log.error(f"Error in workflow starter loop: {e}")
+                self._log.error(f"Error in paced starter loop: {e}")
                 await asyncio.sleep(1)
 
-    async def _stats_reporter_loop(self) -> None:
-        """Infinite loop that reports statistics every interval"""
-        while not self._should_stop:
-            await asyncio.sleep(self._report_interval)
+    async def _source_loop(self, inputs: AsyncIterable[EchoWorkflowInput]) -> None:
+        """Open-loop producer that offers inputs as an external source yields them
 
-            current_time = time.time()
-            time_diff = current_time - self._last_check
-            completed_diff = self._total_workflows - self._last_completed
+        The source sets the timing (e.g. trace replay), inputs arriving while
+        the queue is full are counted as missed. Returns once the source is
+        exhausted and the queued inputs are processed, which ends the run like
+        a completed batch: tracked workflows are awaited without the drain
+        deadline of stop().
+        """
+        async for workflow_input in inputs:
+            try:
+                self._queue.put_nowait((workflow_input, time.perf_counter()))
+            except asyncio.QueueFull:
+                self._missed_inputs += 1
+            else:
+                self._offered_workflows += 1
+        await self._queue.join()
+        self._log.info("Input source exhausted")
 
-            rate = completed_diff / time_diff if time_diff > 0 else 0
+    async def _workflow_worker_loop(self) -> None:
+        """Consumer that starts workflows from the queue until a stop sentinel
 
-            # Report statistics similar to Go version
-            log.info(
-                f"Concurrent: {self._running_tasks} Workflows: {self._total_workflows} Rate: {rate:.2f}",
+        The time an input waited in the queue for a free worker is recorded
+        as the "queue_wait" stage, the backpressure signal of the run.
+        """
+        while True:
+            queued = await self._queue.get()
+            try:
+                if queued is None:
+                    return
+                # Taken right after get: indexes follow the queue (input) order
+                index = self._next_index()
+                workflow_input, queued_at = queued
+                queue_wait = time.perf_counter() - queued_at
+                self._metrics.record_queue_wait(queue_wait)
+                if self._stage_timings is not None:
+                    self._stage_timings.record("queue_wait", queue_wait)
+                await self._start_single_workflow(workflow_input, index)
+            finally:
+                self._queue.task_done()
+
+    async def _stop_workers(self, workers: list[asyncio.Task[None]]) -> int:
+        """Drop not yet started inputs, stop workers and drain in-flight starts
+
+        Returns the number of dropped inputs.
+        """
+        dropped = 0
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            dropped += 1
+        for _ in workers:
+            self._queue.put_nowait(None)
+        await self._drain(workers)
+        return dropped
+
+    def snapshot(self) -> SchedulerStats:
+        """Take current counters and latency histograms since the previous snapshot
+
+        Interval histograms are reset and the snapshot is passed to
+        `stats_callback` if set.
+        """
+        stats = SchedulerStats(
+            started=self._total_workflows,
+            completed=self._completed_workflows,
+            failed=self._failed_workflows,
+            scheduled=self._pacer.scheduled_slots
+            if self._pacer
+            else self._offered_workflows + self._missed_inputs,
+            offered=self._offered_workflows,
+            missed=self._missed_slots(),
+            running=self._running_tasks,
+            queued=self._queue.qsize(),
+            tracking=len(self._completion_tasks),
+            abandoned=self._abandoned_requests + len(self._abandoned_workflows),
+            terminated=self._terminated_workflows,
+            duplicates=self._duplicate_starts,
+            history_events=self._history_events,
+            history_bytes=self._history_bytes,
+            history_samples=self._history_samples,
+            start_latency=self._start_latency,
+            e2e_latency=self._e2e_latency,
+        )
+        self._start_latency = LatencyHistogram()
+        self._e2e_latency = LatencyHistogram()
+        if self._stats_callback is not None:
+            self._stats_callback(stats)
+        return stats
+
+    def _log_total_latencies(self) -> None:
+        for line in self._reporter.total_report(self.snapshot()):
+            self._log.info(line)
+
+    def _missed_slots(self) -> int:
+        return (self._pacer.missed_slots if self._pacer else 0) + self._missed_inputs
+
+    def _log_abandoned(self) -> None:
+        """Report in-flight work cut off by the drain deadline"""
+        if not self._abandoned_requests and not self._abandoned_workflows:
+            return
+        self._log.warning(
+            f"Abandoned after {self._drain_timeout}s drain: "
+            f"{self._abandoned_requests} start/signal/update requests in flight, "
+            f"{len(self._abandoned_workflows)} workflows awaiting results "
+            f"(terminated: {self._terminated_workflows})",
+        )
+        shown = self._abandoned_workflows[:_ABANDONED_IDS_SHOWN]
+        if shown:
+            more = len(self._abandoned_workflows) - len(shown)
+            self._log.warning(
+                f"Abandoned workflows: {', '.join(shown)}"
+                f"{f' and {more} more' if more else ''}",
             )
 
-            self._last_check = current_time
-            self._last_completed = self._total_workflows
+    def _log_batch_progress(self) -> None:
+        done = self._total_workflows + self._failed_workflows + self._duplicate_starts
+        if self._batch_total:
+            self._log.info(
+                f"Progress: {done}/{self._batch_total} "
+                f"({done / self._batch_total:.1%})",
+            )
+        else:
+            self._log.info(f"Progress: {done} inputs processed")
+
+    async def _stats_reporter_loop(self) -> None:
+        """Infinite loop that reports statistics every interval"""
+        while not self._stop_event.is_set():
+            await asyncio.sleep(self._report_interval)
+            for line in self._reporter.interval_report(self.snapshot()):
+                self._log.info(line)
+            if self._batch_total is not None:
+                self._log_batch_progress()
 
     async def run_infinite(
         self,
         message: str = "Scheduler test",
         count: int = 1,
         max_runtime: int | None = None,
+        inputs: AsyncIterable[EchoWorkflowInput] | None = None,
     ) -> None:
         """Run scheduler infinitely, starting workflows continuously
 
@@ -107,88 +595,243 @@ class SchedulerService:
             message: Base message for workflows
             count: Count parameter for EchoWorkflow
             max_runtime: Optional maximum runtime in seconds (None for infinite)
+            inputs: Open-loop source with its own timing, e.g. `replay_inputs`,
+                replaces the generated inputs and stops the run when exhausted
 
         """
-        log.info(
+        pacing = self._rate_profile or (
+            "input source" if inputs is not None else "closed loop"
+        )
+        self._log.info(
             f"Starting infinite scheduler: "
             f"concurrency: {self._concurrency}, "
             f"queue: {self._task_queue}, "
             f"namespace: {self._namespace}, "
+            f"start_mode: {self._start_mode}, "
+            f"echo_strategy: {self._echo_strategy}, "
+            f"track_completion: {self._track_completion}, "
+            f"rate: {pacing}, "
+            f"run_id: {self.run_id}, "
             f"report_interval: {self._report_interval}s",
         )
 
         self._start_time = time.time()
-        self._last_check = self._start_time
+        if inputs is not None:
+            # Report offered and missed inputs of the source like the paced mode
+            self._reporter = StatsReporter(open_loop=True)
+            producer = self._source_loop(inputs)
+        elif self._pacer is not None:
+            producer = self._paced_starter_loop(message, count)
+        else:
+            producer = self._workflow_starter_loop(message, count)
+        self._reporter.restart()
 
         try:
-            # Start background tasks
-            starter_task = asyncio.create_task(
-                self._workflow_starter_loop(message, count),
-            )
-            reporter_task = asyncio.create_task(self._stats_reporter_loop())
-
-            if max_runtime:
-                # Run for specified time
-                await asyncio.sleep(max_runtime)
-            else:
-                # Run indefinitely until interrupted
-                await asyncio.gather(starter_task, reporter_task)
-
-        except KeyboardInterrupt:
-            log.info("Received interrupt signal, stopping scheduler...")
-        finally:
-            self._should_stop = True
+            async with asyncio.TaskGroup() as tasks:
+                workers = [
+                    tasks.create_task(self._workflow_worker_loop())
+                    for _ in range(self._concurrency)
+                ]
+                starter_task = tasks.create_task(producer)
+                reporter_task = tasks.create_task(self._stats_reporter_loop())
+
+                # Run until stop(), the end of the input source or for the
+                # specified time
+                stopped = tasks.create_task(self._stop_event.wait())
+                done, _ = await asyncio.wait(
+                    {stopped, starter_task},
+                    timeout=max_runtime,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                stopped.cancel()
+                if not done:
+                    self._log.info(f"Max runtime of {max_runtime}s reached")
+                    self.stop()
 
-            # Cancel background tasks
-            if "starter_task" in locals():
                 starter_task.cancel()
-            if "reporter_task" in locals():
                 reporter_task.cancel()
-
-            # Wait for running workflows to complete
-            log.info(
-                f"Waiting for {self._running_tasks} running workflows to complete...",
-            )
-            while self._running_tasks > 0:
-                await asyncio.sleep(0.1)
-
+                self._log.info(
+                    f"Waiting for {self._running_tasks} running workflows "
+                    f"to complete...",
+                )
+                dropped = await self._stop_workers(workers)
+                self._log.info(f"Dropped {dropped} queued workflow inputs")
+                await self._wait_completion_trackers()
+            await self._stop_streams()
+        finally:
             # Final statistics
             total_time = time.time() - self._start_time
             final_rate = self._total_workflows / total_time if total_time > 0 else 0
 
-            log.info(
+            missed = (
+                f", Offered: {self._offered_workflows}, "
+                f"Missed slots: {self._missed_slots()}"
+                if self._pacer is not None or inputs is not None
+                else ""
+            )
+
+            self._log.info(
                 f"Scheduler stopped. Total workflows: {self._total_workflows}, "
-                f"Runtime: {total_time:.2f}s, Average rate: {final_rate:.2f} wf/s",
+                f"Completed: {self._completed_workflows}, "
+                f"Failed: {self._failed_workflows}, "
+                f"Runtime: {total_time:.2f}s, Average rate: {final_rate:.2f} wf/s"
+                f"{missed}",
+            )
+            self._log_abandoned()
+            self._log_total_latencies()
+
+    def _set_starts_in_flight(self, count: int) -> None:
+        """Starts in flight as seen by the batch start iterator"""
+        self._running_tasks = self._requests_in_flight = count
+        self._metrics.set_in_flight(count)
+
+    def _record_start_result(self, result: "WorkflowStartResult") -> None:
+        if isinstance(result.error, WorkflowAlreadyStartedError):
+            self._duplicate_starts += 1
+            self._log.debug(
+                "Skipping duplicate start: %s",
+                result.workflow_id,
+                extra=PER_ITEM,
             )
+            return
+        if result.handle is None:
+            self._failed_workflows += 1
+            if result.error is not None:
+                self._metrics.record_failure("start", result.error)
+            self._log.error(
+                "Error starting workflow %s: %s",
+                result.workflow_id,
+                result.error,
+                extra=PER_ITEM,
+            )
+            return
+        self._start_latency.record(result.latency)
+        self._metrics.record_start(result.latency)
+        self._total_workflows += 1
+        if self._track_completion:
+            self._spawn_completion_tracker(result.handle, result.started_at)
+
+    async def _run_batch_starts(self, inputs: Iterable[EchoWorkflowInput]) -> None:
+        """Fire-and-forget starts through the batch API of TemporalService
+
+        After stop() no more inputs are pulled, starts in flight may finish
+        within the drain deadline and are abandoned after it.
+        """
+        results = self._temporal_service.iter_start_echo_workflows(
+            namespace=self._namespace,
+            task_queue=self._task_queue,
+            # No more inputs are pulled after stop()
+            inputs=itertools.takewhile(lambda _: not self._stop_event.is_set(), inputs),
+            max_in_flight=self._concurrency,
+            workflow_ids=self._workflow_ids,
+            options=self._start_options,
+            timings=self._stage_timings,
+            in_flight_callback=self._set_starts_in_flight,
+        )
+
+        async def consume() -> None:
+            # Closing the generator cancels starts that are still in flight
+            async with aclosing(results):
+                async for result in results:
+                    self._record_start_result(result)
+
+        await self._drain([asyncio.create_task(consume())])
+
+    async def _run_batch_executes(self, inputs: Iterable[EchoWorkflowInput]) -> None:
+        """Feed inputs to `concurrency` workers that start (and await) workflows"""
+        workers = [
+            asyncio.create_task(self._workflow_worker_loop())
+            for _ in range(self._concurrency)
+        ]
+        stopped = asyncio.create_task(self._stop_event.wait())
+        try:
+            for workflow_input in inputs:
+                queued = (workflow_input, time.perf_counter())
+                if not self._queue.full():
+                    self._queue.put_nowait(queued)
+                    if stopped.done():
+                        break
+                    continue
+                # All workers are busy, stop() must not wait for a free one
+                put = asyncio.create_task(self._queue.put(queued))
+                await asyncio.wait({put, stopped}, return_when=asyncio.FIRST_COMPLETED)
+                if not put.done():
+                    put.cancel()
+                    break
+        finally:
+            stopped.cancel()
+            if self._stop_event.is_set():
+                dropped = await self._stop_workers(workers)
+                self._log.info(f"Dropped {dropped} queued workflow inputs")
+            else:
+                for _ in workers:
+                    await self._queue.put(None)
+                await self._drain(workers)
 
     async def run(
         self,
         total_workflows: int = 100,
         message: str = "Scheduler test",
+        inputs: Iterable[EchoWorkflowInput] | None = None,
+        count: int = 1,
     ) -> None:
-        """Legacy method for backward compatibility - runs for specific number of workflows"""
-        log.info(
-            f"Starting batch scheduler: {total_workflows} workflows, "
+        """Run a batch of workflows, streaming inputs with constant memory
+
+        Args:
+            total_workflows: Number of synthetic workflows, ignored with `inputs`
+            message: Base message for synthetic workflows
+            inputs: Lazy source of workflow inputs, e.g. `jsonl_inputs`
+            count: Count parameter of synthetic workflows
+
+        """
+        if inputs is None:
+            inputs = synthetic_inputs(
+                total_workflows,
+                message,
+                count=count,
+                strategy=self._echo_strategy,
+            )
+            self._batch_total = total_workflows
+        else:
+            self._batch_total = 0
+        self._log.info(
+            f"Starting batch scheduler: "
+            f"{self._batch_total or 'streamed'} workflows, "
             f"concurrency: {self._concurrency}, "
             f"queue: {self._task_queue}, "
-            f"namespace: {self._namespace}",
+            f"namespace: {self._namespace}, "
+            f"start_mode: {self._start_mode}, "
+            f"echo_strategy: {self._echo_strategy}, "
+            f"run_id: {self.run_id}",
         )
 
         self._start_time = time.time()
+        self._reporter.restart()
+        reporter_task = asyncio.create_task(self._stats_reporter_loop())
 
-        # Create and run all tasks
-        tasks = [
-            self._start_single_workflow(f"{message} #{i}", 1)
-            for i in range(1, total_workflows + 1)
-        ]
+        # Only `concurrency` inputs are pulled from the source at a time
+        try:
+            if self._start_mode == "start":
+                await self._run_batch_starts(inputs)
+            else:
+                await self._run_batch_executes(inputs)
 
-        await asyncio.gather(*tasks, return_exceptions=True)
+            launched_time = time.time() - self._start_time
+            await self._wait_completion_trackers()
+            await self._stop_streams()
+        finally:
+            reporter_task.cancel()
 
         # Final statistics
         elapsed_time = time.time() - self._start_time
-        final_rate = self._total_workflows / elapsed_time if elapsed_time > 0 else 0
+        final_rate = self._total_workflows / launched_time if launched_time > 0 else 0
 
-        log.info(
+        self._log.info(
             f"Batch scheduler completed. Launched {self._total_workflows} workflows "
-            f"in {elapsed_time:.2f}s, final rate: {final_rate:.2f} wf/s",
+            f"in {launched_time:.2f}s, final rate: {final_rate:.2f} wf/s, "
+            f"completed: {self._completed_workflows}, "
+            f"failed: {self._failed_workflows}, "
+            f"total time: {elapsed_time:.2f}s",
         )
+        self._log_abandoned()
+        self._log_total_latencies()
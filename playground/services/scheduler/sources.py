@@ -0,0 +1,66 @@
+"""Lazy workflow input sources for the batch mode of the scheduler
+
+Sources are plain iterators, so a batch of any size is never materialized.
+"""
+
+import json
+import logging
+import sys
+from collections.abc import Iterator
+
+from tasks.shared import EchoStrategy, EchoWorkflowInput
+
+log = logging.getLogger(__name__)
+
+# Source name for reading JSONL from standard input
+STDIN_SOURCE = "-"
+
+
+def synthetic_inputs(
+    total: int,
+    message: str,
+    count: int = 1,
+    strategy: EchoStrategy = "sequential",
+) -> Iterator[EchoWorkflowInput]:
+    """Generate `total` inputs with numbered messages"""
+    for i in range(1, total + 1):
+        yield EchoWorkflowInput(
+            message=f"{message} #{i}",
+            count=count,
+            strategy=strategy,
+        )
+
+
+def jsonl_inputs(
+    source: str,
+    count: int = 1,
+    strategy: EchoStrategy = "sequential",
+    shard_index: int = 0,
+    shard_count: int = 1,
+) -> Iterator[EchoWorkflowInput]:
+    """Read inputs line by line from a JSONL file or stdin ("-")
+
+    A line is either an object with EchoWorkflowInput fields or a plain JSON
+    string used as the message. `count` and `strategy` are the defaults for
+    lines without them.
+    With `shard_count` > 1 only every shard_count-th line starting at
+    `shard_index` is used, so several processes can split one file.
+    Invalid lines are logged and skipped.
+    """
+    file = sys.stdin if source == STDIN_SOURCE else open(source, encoding="utf-8")  # noqa: SIM115
+    try:
+        for line_number, line in enumerate(file, start=1):
+            if (line_number - 1) % shard_count != shard_index or not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+                if isinstance(data, str):
+                    data = {"message": data}
+                yield EchoWorkflowInput.model_validate(
+                    {"count": count, "strategy": strategy, **data},
+                )
+            except (ValueError, TypeError) as e:
+                log.warning(f"Skipping invalid input at {source}:{line_number}: {e}")
+    finally:
+        if file is not sys.stdin:
+            file.close()
@@ -0,0 +1,252 @@
+import math
+import time
+from array import array
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+
+# Each power-of-two range of values is split into 2**_SUB_BUCKET_BITS linear
+# sub-buckets, giving a relative error below 1 / 2**_SUB_BUCKET_BITS (< 0.8%)
+_SUB_BUCKET_BITS = 7
+_SUB_BUCKET_COUNT = 1 << _SUB_BUCKET_BITS
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """Fixed-memory log-linear histogram of latencies (HDR-style)
+
+    Values are recorded in microseconds into a preallocated array of counters,
+    so `record` is O(1) and does not grow memory. Values above the trackable
+    range (`max_exponent` bits, ~19 hours by default) are clamped.
+    """
+
+    def __init__(self, max_exponent: int = 36) -> None:
+        self._max_value = (1 << max_exponent) - 1
+        self._size = (max_exponent - _SUB_BUCKET_BITS + 1) * _SUB_BUCKET_COUNT
+        self._counts = array("Q", bytes(8 * self._size))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def _highest_equivalent(index: int) -> int:
+        shift = index // _SUB_BUCKET_COUNT - 1
+        if shift <= 0:
+            return index
+        mantissa = index - shift * _SUB_BUCKET_COUNT
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        value = int(seconds * 1_000_000)
+        if value < 0:
+            value = 0
+        elif value > self._max_value:
+            value = self._max_value
+        # Values below 2 * _SUB_BUCKET_COUNT map 1:1, larger ones keep their
+        # top _SUB_BUCKET_BITS + 1 bits
+        shift = value.bit_length() - _SUB_BUCKET_BITS - 1
+        if shift <= 0:
+            self._counts[value] += 1
+        else:
+            self._counts[shift * _SUB_BUCKET_COUNT + (value >> shift)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        counts = self._counts
+        for index, bucket_count in enumerate(other._counts):
+            if bucket_count:
+                counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def reset(self) -> None:
+        self._counts = array("Q", bytes(8 * self._size))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def percentile(self, percentile: float) -> float:
+        """Value at the given percentile in seconds (upper bound of its bucket)"""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(percentile / 100 * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max) / 1_000_000
+        return self.max / 1_000_000
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count / 1_000_000 if self.count else 0.0
+
+    def summary(self, percentiles: tuple[float, ...] = DEFAULT_PERCENTILES) -> str:
+        """Human readable percentiles in milliseconds"""
+        parts = [f"p{p:g}={self.percentile(p) * 1000:.1f}ms" for p in percentiles]
+        return (
+            f"{' '.join(parts)} max={self.max / 1000:.1f}ms "
+            f"mean={self.mean * 1000:.1f}ms n={self.count}"
+        )
+
+
+@dataclass
+class SchedulerStats:
+    """Snapshot of scheduler counters plus latency histograms of one interval
+
+    Counters are cumulative since the run started (running/queued/tracking are
+    gauges), histograms only cover the interval since the previous snapshot.
+    Snapshots of several schedulers, e.g. load generator processes, are
+    combined with `merge`.
+    """
+
+    started: int = 0
+    completed: int = 0
+    failed: int = 0
+    scheduled: int = 0
+    offered: int = 0
+    missed: int = 0
+    running: int = 0
+    queued: int = 0
+    tracking: int = 0
+    # Start RPCs and awaited workflows cut off by the drain deadline on stop
+    abandoned: int = 0
+    terminated: int = 0
+    # Starts rejected because the workflow ID was already used (retried run)
+    duplicates: int = 0
+    # Sums over completed workflows that reported their history
+    history_events: int = 0
+    history_bytes: int = 0
+    history_samples: int = 0
+    start_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    e2e_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def add_counters(self, other: "SchedulerStats") -> None:
+        self.started += other.started
+        self.completed += other.completed
+        self.failed += other.failed
+        self.scheduled += other.scheduled
+        self.offered += other.offered
+        self.missed += other.missed
+        self.running += other.running
+        self.queued += other.queued
+        self.tracking += other.tracking
+        self.abandoned += other.abandoned
+        self.terminated += other.terminated
+        self.duplicates += other.duplicates
+        self.history_events += other.history_events
+        self.history_bytes += other.history_bytes
+        self.history_samples += other.history_samples
+
+    def merge(self, other: "SchedulerStats") -> None:
+        self.add_counters(other)
+        self.start_latency.merge(other.start_latency)
+        self.e2e_latency.merge(other.e2e_latency)
+
+
+class StatsAggregator:
+    """Combines the latest counters and pending histograms of several schedulers
+
+    Snapshots are added per source (process, target), `take` returns the sum
+    of the latest counters with the histograms added since the previous take.
+    """
+
+    def __init__(self) -> None:
+        self._latest: dict[Hashable, SchedulerStats] = {}
+        self._pending = SchedulerStats()
+        self.updated = False
+
+    def add(self, source: Hashable, stats: SchedulerStats) -> None:
+        self.updated = True
+        self._pending.start_latency.merge(stats.start_latency)
+        self._pending.e2e_latency.merge(stats.e2e_latency)
+        self._latest[source] = stats
+
+    def take(self) -> SchedulerStats:
+        combined = SchedulerStats(
+            start_latency=self._pending.start_latency,
+            e2e_latency=self._pending.e2e_latency,
+        )
+        for stats in self._latest.values():
+            combined.add_counters(stats)
+        self._pending = SchedulerStats()
+        self.updated = False
+        return combined
+
+
+class StatsReporter:
+    """Formats successive SchedulerStats snapshots into report lines
+
+    Keeps the previous snapshot to compute interval rates and merges interval
+    histograms into run totals for the final summary.
+    """
+
+    def __init__(self, open_loop: bool = False) -> None:
+        self._open_loop = open_loop
+        self._last = SchedulerStats()
+        self._last_time = time.time()
+        self.total_start_latency = LatencyHistogram()
+        self.total_e2e_latency = LatencyHistogram()
+
+    def restart(self) -> None:
+        self._last = SchedulerStats()
+        self._last_time = time.time()
+        self.total_start_latency.reset()
+        self.total_e2e_latency.reset()
+
+    def _merge_totals(self, stats: SchedulerStats) -> None:
+        self.total_start_latency.merge(stats.start_latency)
+        self.total_e2e_latency.merge(stats.e2e_latency)
+
+    def interval_report(self, stats: SchedulerStats) -> list[str]:
+        current_time = time.time()
+        time_diff = current_time - self._last_time
+        last = self._last
+        rate = (stats.started - last.started) / time_diff if time_diff > 0 else 0
+
+        # Report statistics similar to Go version
+        line = (
+            f"Concurrent: {stats.running} Workflows: {stats.started} Rate: {rate:.2f} "
+            f"Queued: {stats.queued} Completed: {stats.completed} "
+            f"Failed: {stats.failed} Tracking: {stats.tracking}"
+        )
+        if self._open_loop and time_diff > 0:
+            # Target vs offered rate and missed send slots of the open-loop mode
+            line += (
+                f" Target: {(stats.scheduled - last.scheduled) / time_diff:.2f} "
+                f"Offered: {(stats.offered - last.offered) / time_diff:.2f} "
+                f"Missed: {stats.missed - last.missed} (total {stats.missed})"
+            )
+
+        self._merge_totals(stats)
+        self._last = stats
+        self._last_time = current_time
+        return [
+            line,
+            f"Start latency: {stats.start_latency.summary()}",
+            f"E2E latency: {stats.e2e_latency.summary()}",
+        ]
+
+    def total_report(self, stats: SchedulerStats | None = None) -> list[str]:
+        """Run totals, `stats` is the last (not yet reported) snapshot if any"""
+        if stats is not None:
+            self._merge_totals(stats)
+            self._last = stats
+        lines = [
+            f"Start latency (total): {self.total_start_latency.summary()}",
+            f"E2E latency (total): {self.total_e2e_latency.summary()}",
+        ]
+        last = self._last
+        if last.duplicates:
+            lines.append(f"Duplicate starts skipped: {last.duplicates}")
+        if last.history_samples:
+            lines.append(
+                f"History per workflow: "
+                f"{last.history_events / last.history_samples:.1f} events, "
+                f"{last.history_bytes / last.history_samples:.0f} bytes "
+                f"(n={last.history_samples})",
+            )
+        return lines
@@ -0,0 +1,41 @@
+"""Weighted namespace / task queue targets of one load generator
+
+The load is split between targets by weight: each target runs its own
+SchedulerService with its share of the total workflows and target rate, and
+its own concurrency budget (explicit or the weight share of the total). The
+mix is exact in batch and open-loop modes; in the closed loop the achieved
+mix also depends on the latency of each target.
+"""
+
+from pydantic import BaseModel, Field
+
+
+class SchedulerTarget(BaseModel):
+    namespace: str
+    task_queue: str
+    weight: float = Field(default=1, gt=0)
+    # Concurrency budget of the target, 0 = weight share of the total
+    concurrency: int = Field(default=0, ge=0)
+
+    @property
+    def name(self) -> str:
+        return f"{self.namespace}/{self.task_queue}"
+
+
+def weighted_shares(total: int, weights: list[float]) -> list[int]:
+    """Split an integer budget by weight, shares sum up to `total`
+
+    Largest remainder rounding: the floor of every exact share, the rest
+    goes to the shares with the largest fractional parts.
+    """
+    total_weight = sum(weights)
+    exact = [total * weight / total_weight for weight in weights]
+    shares = [int(share) for share in exact]
+    by_remainder = sorted(
+        range(len(weights)),
+        key=lambda index: exact[index] - shares[index],
+        reverse=True,
+    )
+    for index in by_remainder[: total - sum(shares)]:
+        shares[index] += 1
+    return shares
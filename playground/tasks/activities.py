@@ -2,12 +2,19 @@ import logging
 
 from temporalio import activity
 
-from .shared import EchoActivityInput
+from infra.logs import PER_ITEM
+
+from .shared import EchoActivityInput, EchoBatchActivityInput
 
 log = logging.getLogger(__name__)
 
 
 @activity.defn(name="echo")
 async def echo(data: EchoActivityInput):
-    data = EchoActivityInput.model_validate(data)
-    log.info(f"Echoing {data.message}")
+    log.info("Echoing %s", data.message, extra=PER_ITEM)
+
+
+@activity.defn(name="echo_batch")
+async def echo_batch(data: EchoBatchActivityInput):
+    for _ in range(data.count):
+        log.info("Echoing %s", data.message, extra=PER_ITEM)
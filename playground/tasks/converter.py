@@ -0,0 +1,123 @@
+"""Compact binary payload converter for the echo task models
+
+Echo inputs are packed with `struct` instead of JSON through pydantic:
+a one byte type tag, the fixed size fields and the UTF-8 message as the tail.
+Decoding skips validation, payloads with this encoding are only produced by
+`EchoStructPayloadConverter` itself. Everything else falls back to the
+pydantic JSON converter.
+
+Workers must use this converter before clients start sending such payloads,
+a worker with the plain pydantic converter can't decode them.
+"""
+
+import struct
+from typing import Any, get_args
+
+from pydantic import BaseModel
+from temporalio.api.common.v1 import Payload
+from temporalio.contrib.pydantic import PydanticPayloadConverter
+from temporalio.converter import (
+    CompositePayloadConverter,
+    DataConverter,
+    EncodingPayloadConverter,
+)
+
+from .shared import (
+    EchoActivityInput,
+    EchoBatchActivityInput,
+    EchoStrategy,
+    EchoWorkflowInput,
+)
+
+_ENCODING = "binary/echo"
+_ENCODING_METADATA = {"encoding": _ENCODING.encode()}
+
+_TAG = struct.Struct("<B")
+_WORKFLOW_INPUT = struct.Struct("<BqB")  # tag, count, strategy index
+_BATCH_ACTIVITY_INPUT = struct.Struct("<Bq")  # tag, count
+_WORKFLOW_INPUT_TAG = 1
+_ACTIVITY_INPUT_TAG = 2
+_BATCH_ACTIVITY_INPUT_TAG = 3
+
+_STRATEGIES: tuple[str, ...] = get_args(EchoStrategy)
+_STRATEGY_INDEXES = {strategy: index for index, strategy in enumerate(_STRATEGIES)}
+
+_TAGS = {
+    EchoWorkflowInput.__name__: _WORKFLOW_INPUT_TAG,
+    EchoActivityInput.__name__: _ACTIVITY_INPUT_TAG,
+    EchoBatchActivityInput.__name__: _BATCH_ACTIVITY_INPUT_TAG,
+}
+_MODELS: dict[int, type[BaseModel]] = {
+    _WORKFLOW_INPUT_TAG: EchoWorkflowInput,
+    _ACTIVITY_INPUT_TAG: EchoActivityInput,
+    _BATCH_ACTIVITY_INPUT_TAG: EchoBatchActivityInput,
+}
+
+
+def _model_class(tag: int, type_hint: type | None) -> type[BaseModel]:
+    # Workflow sandbox re-imports tasks.shared, so the type hint may be a
+    # different class object than the one imported here; prefer the hint
+    model = _MODELS.get(tag)
+    if model is None:
+        raise ValueError(f"Unknown echo payload tag {tag}")
+    if isinstance(type_hint, type) and type_hint.__name__ == model.__name__:
+        return type_hint
+    return model
+
+
+class EchoStructPayloadConverter(EncodingPayloadConverter):
+    @property
+    def encoding(self) -> str:
+        return _ENCODING
+
+    def to_payload(self, value: Any) -> Payload | None:
+        value_type = type(value)
+        if value_type.__module__ != EchoWorkflowInput.__module__:
+            return None
+        tag = _TAGS.get(value_type.__name__)
+        if tag == _WORKFLOW_INPUT_TAG:
+            data = _WORKFLOW_INPUT.pack(
+                tag,
+                value.count,
+                _STRATEGY_INDEXES[value.strategy],
+            )
+            data += value.message.encode()
+        elif tag == _BATCH_ACTIVITY_INPUT_TAG:
+            data = _BATCH_ACTIVITY_INPUT.pack(tag, value.count) + value.message.encode()
+        elif tag == _ACTIVITY_INPUT_TAG:
+            data = _TAG.pack(tag) + value.message.encode()
+        else:
+            return None
+        return Payload(metadata=_ENCODING_METADATA, data=data)
+
+    def from_payload(self, payload: Payload, type_hint: type | None = None) -> Any:
+        data = payload.data
+        tag = data[0]
+        model = _model_class(tag, type_hint)
+        if tag == _WORKFLOW_INPUT_TAG:
+            _, count, strategy = _WORKFLOW_INPUT.unpack_from(data)
+            return model.model_construct(
+                message=data[_WORKFLOW_INPUT.size :].decode(),
+                count=count,
+                strategy=_STRATEGIES[strategy],
+            )
+        if tag == _BATCH_ACTIVITY_INPUT_TAG:
+            _, count = _BATCH_ACTIVITY_INPUT.unpack_from(data)
+            return model.model_construct(
+                message=data[_BATCH_ACTIVITY_INPUT.size :].decode(),
+                count=count,
+            )
+        return model.model_construct(message=data[_TAG.size :].decode())
+
+
+class EchoPayloadConverter(CompositePayloadConverter):
+    """Pydantic payload converter with struct packing of the echo models"""
+
+    def __init__(self) -> None:
+        super().__init__(
+            EchoStructPayloadConverter(),
+            *PydanticPayloadConverter().converters.values(),
+        )
+
+
+echo_data_converter = DataConverter(payload_converter_class=EchoPayloadConverter)
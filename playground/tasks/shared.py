@@ -1,10 +1,46 @@
+from typing import Literal
+
 from pydantic import BaseModel
 
+# How EchoWorkflow runs its `count` echoes:
+# "sequential" - one activity after another
+# "parallel" - all activities at once
+# "local" - sequential local activities, no activity tasks on the server
+# "batched" - a single activity echoing all messages
+EchoStrategy = Literal["sequential", "parallel", "local", "batched"]
+
 
 class EchoActivityInput(BaseModel):
     message: str
 
 
+class EchoBatchActivityInput(BaseModel):
+    message: str
+    count: int
+
+
 class EchoWorkflowInput(BaseModel):
     message: str
     count: int
+    strategy: EchoStrategy = "sequential"
+
+
+class EchoWorkflowResult(BaseModel):
+    # History of the workflow run when it completed
+    history_length: int
+    history_size: int
+
+
+# Error type of "echo_sync" updates rejected while EchoStreamWorkflow waits to
+# continue as new, a retry reaches the next run
+STREAM_CONTINUING_AS_NEW = "StreamContinuingAsNew"
+
+
+class EchoStreamInput(BaseModel):
+    # Continue-as-new thresholds, the server also suggests it near its limits
+    max_history_length: int = 10_000
+    max_history_size: int = 10 * 1024 * 1024
+    # State carried over continue-as-new
+    processed: int = 0
+    pending: list[str] = []
+    stopping: bool = False
@@ -1,18 +1,171 @@
+import asyncio
 from datetime import timedelta
 
 from temporalio import workflow
+from temporalio.exceptions import ApplicationError
 
-from .shared import EchoActivityInput, EchoWorkflowInput
+from .shared import (
+    STREAM_CONTINUING_AS_NEW,
+    EchoActivityInput,
+    EchoBatchActivityInput,
+    EchoStreamInput,
+    EchoWorkflowInput,
+    EchoWorkflowResult,
+)
 
+ACTIVITY_TIMEOUT = timedelta(seconds=10)
 
-@workflow.defn(name="EchoWorkflow")
-class EchoWorkflow:
-    @workflow.run
-    async def run(self, data: EchoWorkflowInput):
-        data = EchoWorkflowInput.model_validate(data)
+
+async def _echo(data: EchoWorkflowInput) -> None:
+    """Echo `data.message` `data.count` times with the requested strategy"""
+    activity_input = EchoActivityInput(message=data.message)
+    if data.strategy == "parallel":
+        await asyncio.gather(
+            *(
+                workflow.execute_activity(
+                    "echo",
+                    activity_input,
+                    start_to_close_timeout=ACTIVITY_TIMEOUT,
+                )
+                for _ in range(data.count)
+            ),
+        )
+    elif data.strategy == "local":
+        for _ in range(data.count):
+            await workflow.execute_local_activity(
+                "echo",
+                activity_input,
+                start_to_close_timeout=ACTIVITY_TIMEOUT,
+            )
+    elif data.strategy == "batched" and data.count > 0:
+        await workflow.execute_activity(
+            "echo_batch",
+            EchoBatchActivityInput(message=data.message, count=data.count),
+            start_to_close_timeout=ACTIVITY_TIMEOUT,
+        )
+    else:
         for _ in range(data.count):
             await workflow.execute_activity(
                 "echo",
-                EchoActivityInput(message=data.message),
-                start_to_close_timeout=timedelta(seconds=10),
+                activity_input,
+                start_to_close_timeout=ACTIVITY_TIMEOUT,
+            )
+
+
+@workflow.defn(name="EchoWorkflow")
+class EchoWorkflow:
+    @workflow.run
+    async def run(self, data: EchoWorkflowInput) -> EchoWorkflowResult:
+        await _echo(data)
+
+        info = workflow.info()
+        return EchoWorkflowResult(
+            history_length=info.get_current_history_length(),
+            history_size=info.get_current_history_size(),
+        )
+
+
+@workflow.defn(name="EchoStreamWorkflow")
+class EchoStreamWorkflow:
+    """Long-running echo of messages received through the "echo" signal
+
+    Pending messages are echoed in parallel batches, the "echo_sync" update
+    echoes an EchoWorkflowInput like EchoWorkflow and returns the message for
+    request-response. The workflow continues as new once its history crosses
+    the thresholds of the input, so replay cost stays bounded, and completes
+    after the "stop" signal once drained. Updates are rejected from then on,
+    otherwise a steady update load could postpone continue-as-new forever.
+    """
+
+    @workflow.init
+    def __init__(self, data: EchoStreamInput) -> None:
+        self._input = data
+        self._pending: list[str] = []
+        self._stopping = False
+        # Set once the history crossed a threshold, until continue-as-new
+        self._continuing = False
+        # Echoed messages of signals and updates, including previous runs
+        self._processed = 0
+
+    @workflow.signal(name="echo")
+    def echo(self, data: EchoActivityInput) -> None:
+        self._pending.append(data.message)
+
+    @workflow.signal(name="stop")
+    def stop(self) -> None:
+        self._stopping = True
+
+    @workflow.update(name="echo_sync")
+    async def echo_sync(self, data: EchoWorkflowInput) -> str:
+        await _echo(data)
+        self._processed += 1
+        return data.message
+
+    @echo_sync.validator
+    def validate_echo_sync(self, data: EchoWorkflowInput) -> None:
+        # Rejected updates are not written to the history
+        if self._stopping:
+            raise ValueError("Stream workflow is stopping")
+        if self._continuing or self._history_exceeded(self._input):
+            raise ApplicationError(
+                "Stream workflow is continuing as new",
+                type=STREAM_CONTINUING_AS_NEW,
             )
+
+    def _history_exceeded(self, data: EchoStreamInput) -> bool:
+        info = workflow.info()
+        return (
+            info.is_continue_as_new_suggested()
+            or info.get_current_history_length() >= data.max_history_length
+            or info.get_current_history_size() >= data.max_history_size
+        )
+
+    @workflow.run
+    async def run(self, data: EchoStreamInput) -> int:
+        # Signals of the first activation may already be queued
+        self._pending[:0] = data.pending
+        self._stopping = self._stopping or data.stopping
+        self._processed += data.processed
+
+        while True:
+            # Updates grow the history without pending messages, so history
+            # thresholds wake the loop too
+            await workflow.wait_condition(
+                lambda: (
+                    bool(self._pending)
+                    or self._stopping
+                    or self._history_exceeded(data)
+                ),
+            )
+            while self._pending:
+                batch, self._pending = self._pending, []
+                await asyncio.gather(
+                    *(
+                        workflow.execute_activity(
+                            "echo",
+                            EchoActivityInput(message=message),
+                            start_to_close_timeout=ACTIVITY_TIMEOUT,
+                        )
+                        for message in batch
+                    ),
+                )
+                self._processed += len(batch)
+                if self._history_exceeded(data):
+                    break
+
+            if self._history_exceeded(data):
+                # New updates are rejected, accepted ones finish in this run
+                self._continuing = True
+                await workflow.wait_condition(workflow.all_handlers_finished)
+                workflow.continue_as_new(
+                    data.model_copy(
+                        update={
+                            "processed": self._processed,
+                            "pending": self._pending,
+                            "stopping": self._stopping,
+                        },
+                    ),
+                )
+            if self._stopping and not self._pending:
+                await workflow.wait_condition(workflow.all_handlers_finished)
+                return self._processed
@@ -0,0 +1,54 @@
+"""CompressionCodec only replaces payloads it makes smaller"""
+
+import os
+
+import pytest
+from temporalio.api.common.v1 import Payload
+
+from infra.temporalio_utils.codec import CompressionCodec
+
+
+def _payload(data: bytes) -> Payload:
+    return Payload(metadata={"encoding": b"json/plain"}, data=data)
+
+
+@pytest.mark.asyncio
+async def test_round_trip() -> None:
+    codec = CompressionCodec(threshold=1024)
+    payload = _payload(b'"' + b"x" * 10_000 + b'"')
+
+    [encoded] = await codec.encode([payload])
+    assert encoded.metadata["encoding"] == b"binary/zlib"
+    assert encoded.ByteSize() < payload.ByteSize() // 10
+
+    [decoded] = await codec.decode([encoded])
+    assert decoded == payload
+
+
+@pytest.mark.asyncio
+async def test_below_threshold_kept() -> None:
+    codec = CompressionCodec(threshold=1024)
+    payload = _payload(b"x" * 1023)
+    assert await codec.encode([payload]) == [payload]
+
+
+@pytest.mark.parametrize("size", [16, 4096])
+@pytest.mark.asyncio
+async def test_kept_when_not_smaller(size: int) -> None:
+    # Random data does not compress, the wrapper would only add bytes
+    codec = CompressionCodec(threshold=0)
+    payload = _payload(os.urandom(size))
+    [encoded] = await codec.encode([payload])
+    assert encoded == payload
+
+
+@pytest.mark.asyncio
+async def test_decode_passes_other_encodings() -> None:
+    codec = CompressionCodec()
+    payload = _payload(b"x" * 10_000)
+    assert await codec.decode([payload]) == [payload]
+
+
+def test_unknown_algorithm() -> None:
+    with pytest.raises(ValueError, match="Unknown compression algorithm"):
+        CompressionCodec(algorithm="lz4", level=1)  # type: ignore[arg-type]
@@ -0,0 +1,47 @@
+"""Echo models round-trip through the struct payload converter"""
+
+import pytest
+from pydantic import BaseModel
+from tasks.converter import echo_data_converter
+from tasks.shared import (
+    EchoActivityInput,
+    EchoBatchActivityInput,
+    EchoStreamInput,
+    EchoWorkflowInput,
+)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        EchoWorkflowInput(message="hello", count=3),
+        EchoWorkflowInput(message="", count=2**40, strategy="batched"),
+        EchoWorkflowInput(message="héllo ✓" * 100, count=1, strategy="local"),
+        EchoActivityInput(message="hello"),
+        EchoActivityInput(message=""),
+        EchoBatchActivityInput(message="hello", count=7),
+    ],
+)
+def test_struct_round_trip(value: BaseModel) -> None:
+    converter = echo_data_converter.payload_converter
+    [payload] = converter.to_payloads([value])
+    assert payload.metadata["encoding"] == b"binary/echo"
+    # Tag and fixed size fields only, no field names
+    assert len(payload.data) <= 10 + len(value.message.encode())
+
+    [decoded] = converter.from_payloads([payload], [type(value)])
+    assert type(decoded) is type(value)
+    assert decoded == value
+
+
+@pytest.mark.parametrize(
+    "value",
+    [EchoStreamInput(pending=["a"]), {"message": "hello"}, "hello", 3, None],
+)
+def test_other_values_fall_back(value: object) -> None:
+    converter = echo_data_converter.payload_converter
+    [payload] = converter.to_payloads([value])
+    assert payload.metadata["encoding"] != b"binary/echo"
+
+    [decoded] = converter.from_payloads([payload], [type(value)])
+    assert decoded == value
@@ -0,0 +1,47 @@
+"""Workflow ID schemes and UUIDv7 layout"""
+
+import re
+import uuid
+
+import pytest
+
+from infra.temporalio_utils.ids import Uuid7, new_run_id, workflow_id_generator
+
+
+def test_uuid7_layout() -> None:
+    value = uuid.UUID(Uuid7()())
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+
+
+def test_uuid7_monotonic() -> None:
+    uuid7 = Uuid7()
+    # More IDs than fit in the counter of one millisecond
+    ids = [uuid7() for _ in range(10_000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+@pytest.mark.parametrize("scheme", ["sequential", "deterministic"])
+def test_index_schemes(scheme: str) -> None:
+    generate = workflow_id_generator(scheme, "echo-run")
+    assert [generate(index) for index in range(3)] == [
+        "echo-run-0",
+        "echo-run-1",
+        "echo-run-2",
+    ]
+
+
+@pytest.mark.parametrize(("scheme", "version"), [("uuid7", 7), ("uuid4", 4)])
+def test_uuid_schemes(scheme: str, version: int) -> None:
+    generate = workflow_id_generator(scheme, "echo-run")
+    ids = [generate(0) for _ in range(100)]
+    assert len(set(ids)) == len(ids)
+    for workflow_id in ids:
+        prefix, _, suffix = workflow_id.partition("-run-")
+        assert prefix == "echo"
+        assert uuid.UUID(suffix).version == version
+
+
+def test_run_id_format() -> None:
+    assert re.fullmatch(r"\d{8}-\d{6}-[0-9a-f]{4}", new_run_id())
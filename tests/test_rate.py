@@ -0,0 +1,115 @@
+"""RateProfile shapes and RatePacer slots on a fake clock"""
+
+from types import SimpleNamespace
+
+import pytest
+from services.scheduler import rate
+from services.scheduler.rate import RatePacer, RateProfile
+
+
+class FakeClock:
+    """Monotonic clock advanced only by the pacer sleeps"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(rate, "time", SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(rate, "asyncio", SimpleNamespace(sleep=clock.sleep))
+    return clock
+
+
+@pytest.mark.parametrize(
+    ("profile", "expected"),
+    [
+        (RateProfile(rate=5), [5, 5, 5]),
+        (
+            RateProfile(kind="step", rate=10, step=10, step_interval=10, max_rate=25),
+            [10, 20, 25],
+        ),
+        (
+            RateProfile(kind="ramp", rate=0, max_rate=100, ramp_duration=20),
+            [0, 50, 100],
+        ),
+        (
+            RateProfile(
+                kind="spike",
+                rate=1,
+                max_rate=50,
+                spike_start=5,
+                spike_duration=2,
+                spike_period=10,
+            ),
+            [1, 50, 50],
+        ),
+    ],
+)
+def test_rate_at(profile: RateProfile, expected: list[float]) -> None:
+    # Spike repeats at 5 and 15
+    elapsed = (0, 5, 15) if profile.kind == "spike" else (0, 10, 20)
+    assert [profile.rate_at(t) for t in elapsed] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    ("profile", "open_loop"),
+    [
+        (RateProfile(), False),
+        (RateProfile(rate=1), True),
+        (RateProfile(kind="step", step=5), True),
+        (RateProfile(kind="ramp", max_rate=100), True),
+        (RateProfile(kind="spike", max_rate=100), True),
+        (RateProfile(kind="ramp"), False),
+    ],
+)
+def test_open_loop(profile: RateProfile, open_loop: bool) -> None:
+    assert profile.open_loop is open_loop
+
+
+@pytest.mark.asyncio
+async def test_constant_rate_slots(clock: FakeClock) -> None:
+    pacer = RatePacer(RateProfile(rate=10))
+    pacer.start()
+    started = clock.now
+
+    assert [await pacer.wait() for _ in range(11)] == [1] * 11
+    assert clock.now - started == pytest.approx(1.0)
+    assert pacer.scheduled_slots == 11
+    assert pacer.missed_slots == 0
+
+
+@pytest.mark.asyncio
+async def test_stall_releases_overdue_slots(clock: FakeClock) -> None:
+    pacer = RatePacer(RateProfile(rate=10), max_burst=5)
+    pacer.start()
+    assert await pacer.wait() == 1
+
+    # A stall of just over 1s leaves 10 slots due, the burst is capped
+    clock.now += 1.05
+    assert await pacer.wait() == 5
+    assert pacer.scheduled_slots == 11
+    assert pacer.missed_slots == 5
+    # No drift: the next slot is the one after the last overdue slot
+    assert await pacer.wait() == 1
+    assert clock.now - 1000.0 == pytest.approx(1.1)
+
+
+@pytest.mark.asyncio
+async def test_ramp_from_zero(clock: FakeClock) -> None:
+    pacer = RatePacer(RateProfile(kind="ramp", rate=0, max_rate=100, ramp_duration=1))
+    pacer.start()
+
+    released = 0
+    while clock.now - 1000.0 < 2.0:
+        released += await pacer.wait()
+    # ~50 slots during the ramp and ~100 at full rate
+    assert 140 <= released <= 160
+    assert pacer.missed_slots == 0
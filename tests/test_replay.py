@@ -0,0 +1,116 @@
+"""Trace records are validated, sharded and replayed with their targets"""
+
+import json
+import logging
+from pathlib import Path
+
+import pytest
+from services.scheduler.replay import (
+    TraceRecord,
+    _parse_record,
+    read_trace,
+    replay_inputs,
+)
+
+
+def _write_trace(path: Path, lines: list[object]) -> Path:
+    path.write_text(
+        "\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines)
+        + "\n",
+    )
+    return path
+
+
+def test_parse_record() -> None:
+    record = _parse_record(
+        b'{"ts": "2024-06-10T00:00:00+00:00", "namespace": "ns1", '
+        b'"task_queue": "a", "size": 512, "count": 3.0, "strategy": "parallel"}',
+    )
+    assert record == TraceRecord(
+        timestamp=1717977600.0,
+        namespace="ns1",
+        task_queue="a",
+        size=512,
+        count=3,
+        strategy="parallel",
+    )
+    assert _parse_record(b'{"ts": 1.5}') == TraceRecord(timestamp=1.5)
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        b"not json",
+        b"[1, 2]",
+        b'{"namespace": "ns1"}',
+        b'{"ts": "yesterday"}',
+        b'{"ts": 1, "count": 0}',
+        b'{"ts": 1, "count": 1.5}',
+        b'{"ts": 1, "count": true}',
+        b'{"ts": 1, "count": "3"}',
+        b'{"ts": 1, "size": -1}',
+        b'{"ts": 1, "strategy": "random"}',
+        b'{"ts": 1, "namespace": 1}',
+        b'{"ts": 1, "message": ["x"]}',
+    ],
+)
+def test_parse_invalid_record(line: bytes) -> None:
+    with pytest.raises((ValueError, TypeError, KeyError)):
+        _parse_record(line)
+
+
+def test_read_trace_skips_invalid_lines(
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    path = _write_trace(
+        tmp_path / "trace.jsonl",
+        [{"ts": 1}, "not json", "", {"ts": 2, "count": 0}, {"ts": 3}],
+    )
+    with caplog.at_level(logging.WARNING):
+        records = list(read_trace(path))
+    assert [record.timestamp for record in records] == [1, 3]
+    assert [record.message.split(": ", 1)[0] for record in caplog.records] == [
+        f"Skipping invalid record at {path}:2",
+        f"Skipping invalid record at {path}:4",
+    ]
+
+
+def test_read_trace_shards(tmp_path: Path) -> None:
+    path = _write_trace(tmp_path / "trace.jsonl", [{"ts": ts} for ts in range(10)])
+    shards = [
+        [record.timestamp for record in read_trace(path, index, 3)]
+        for index in range(3)
+    ]
+    assert shards == [[0, 3, 6, 9], [1, 4, 7], [2, 5, 8]]
+
+
+def test_read_empty_trace(tmp_path: Path) -> None:
+    path = tmp_path / "trace.jsonl"
+    path.touch()
+    assert list(read_trace(path)) == []
+
+
+@pytest.mark.asyncio
+async def test_replay_inputs_by_target() -> None:
+    records = [
+        TraceRecord(timestamp=0, namespace="ns1", task_queue="a", size=3),
+        TraceRecord(timestamp=0, namespace="ns2", task_queue="a", message="m"),
+        # Target taken from the default target
+        TraceRecord(timestamp=0, size=1, count=2, strategy="local"),
+    ]
+    inputs = [
+        value
+        async for value in replay_inputs(
+            records,
+            start=0,
+            count=5,
+            namespace="ns1",
+            task_queue="a",
+            default_target=("ns1", "a"),
+        )
+    ]
+    assert [(value.message, value.count, value.strategy) for value in inputs] == [
+        ("xxx", 5, "sequential"),
+        ("x", 2, "local"),
+    ]
@@ -0,0 +1,65 @@
+"""LatencyHistogram percentiles stay within the bucket precision"""
+
+import pytest
+from services.scheduler.stats import LatencyHistogram
+
+
+def test_empty() -> None:
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99) == 0.0
+    assert histogram.mean == 0.0
+    assert histogram.count == 0
+
+
+def test_percentiles() -> None:
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+
+    assert histogram.count == 1000
+    assert histogram.max == 1_000_000
+    assert histogram.mean == pytest.approx(0.5005)
+    for percentile, expected in ((50, 0.5), (90, 0.9), (99, 0.99)):
+        # Upper bound of the bucket, at most 1/128 above the recorded value
+        assert expected <= histogram.percentile(percentile) <= expected * 1.01
+    assert histogram.percentile(100) == 1.0
+
+
+def test_small_values_are_exact() -> None:
+    histogram = LatencyHistogram()
+    for us in (1, 2, 3, 200):
+        histogram.record(us / 1_000_000)
+    assert histogram.percentile(25) == 1e-6
+    assert histogram.percentile(75) == 3e-6
+    assert histogram.percentile(100) == 200e-6
+
+
+def test_clamps_out_of_range_values() -> None:
+    histogram = LatencyHistogram(max_exponent=20)
+    histogram.record(-1)
+    histogram.record(3600)
+    assert histogram.percentile(50) == 0.0
+    assert histogram.max == (1 << 20) - 1
+    assert histogram.percentile(100) == histogram.max / 1_000_000
+
+
+def test_merge_and_reset() -> None:
+    merged = LatencyHistogram()
+    combined = LatencyHistogram()
+    for part in range(3):
+        histogram = LatencyHistogram()
+        for ms in range(part * 100, (part + 1) * 100):
+            histogram.record(ms / 1000)
+            combined.record(ms / 1000)
+        merged.merge(histogram)
+
+    assert merged.count == combined.count
+    assert merged.total == combined.total
+    assert merged.max == combined.max
+    for percentile in (1, 50, 99, 99.9):
+        assert merged.percentile(percentile) == combined.percentile(percentile)
+
+    merged.reset()
+    assert merged.count == 0
+    assert merged.max == 0
+    assert merged.percentile(50) == 0.0
@@ -0,0 +1,95 @@
+"""EchoStreamWorkflow continues as new under a steady "echo_sync" update load
+
+Runs against the Temporal dev server of `WorkflowEnvironment.start_local`,
+downloaded on first use; set TEMPORAL_DEV_SERVER_PATH to a local `temporal`
+CLI binary to run without network access.
+"""
+
+import asyncio
+import os
+import uuid
+
+import pytest
+from tasks.activities import echo, echo_batch
+from tasks.shared import EchoStreamInput
+from tasks.workflows import EchoStreamWorkflow
+from temporalio.contrib.pydantic import pydantic_data_converter
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import Worker
+
+from infra.temporalio_utils.pool import ClientPool
+from infra.temporalio_utils.service import TemporalService
+
+NAMESPACE = "default"
+# Low enough for a few dozen updates to cross it
+MAX_HISTORY_LENGTH = 100
+UPDATERS = 10
+# Runs that must be observed while updates keep coming
+EXPECTED_RUNS = 3
+TIMEOUT = 60
+
+
+@pytest.mark.asyncio
+async def test_continue_as_new_under_continuous_updates() -> None:
+    async with await WorkflowEnvironment.start_local(
+        namespace=NAMESPACE,
+        data_converter=pydantic_data_converter,
+        dev_server_existing_path=os.environ.get("TEMPORAL_DEV_SERVER_PATH"),
+    ) as env:
+        client = env.client
+        task_queue = f"stream-test-{uuid.uuid4().hex[:8]}"
+        workflow_id = f"echo-stream-test-{uuid.uuid4().hex[:8]}"
+        service = TemporalService({NAMESPACE: ClientPool([client])})
+        stop_updates = asyncio.Event()
+        echoed = 0
+
+        async def update_loop(index: int) -> None:
+            nonlocal echoed
+            sent = 0
+            while not stop_updates.is_set():
+                await service.execute_echo_update(
+                    namespace=NAMESPACE,
+                    task_queue=task_queue,
+                    workflow_id=workflow_id,
+                    message=f"update {index}-{sent}",
+                    with_start=False,
+                )
+                sent += 1
+                echoed += 1
+
+        async def wait_runs() -> set[str]:
+            runs: set[str] = set()
+            while len(runs) < EXPECTED_RUNS:
+                description = await client.get_workflow_handle(workflow_id).describe()
+                runs.add(description.run_id)
+                await asyncio.sleep(0.1)
+            return runs
+
+        async with Worker(
+            client,
+            task_queue=task_queue,
+            workflows=[EchoStreamWorkflow],
+            activities=[echo, echo_batch],
+        ):
+            await client.start_workflow(
+                EchoStreamWorkflow.run,
+                EchoStreamInput(max_history_length=MAX_HISTORY_LENGTH),
+                id=workflow_id,
+                task_queue=task_queue,
+            )
+            updaters = [
+                asyncio.create_task(update_loop(index)) for index in range(UPDATERS)
+            ]
+            try:
+                runs = await asyncio.wait_for(wait_runs(), TIMEOUT)
+            finally:
+                stop_updates.set()
+                await asyncio.gather(*updaters)
+
+            handle = client.get_workflow_handle(workflow_id)
+            await handle.signal(EchoStreamWorkflow.stop)
+            processed = await handle.result()
+
+        assert len(runs) >= EXPECTED_RUNS
+        # Rejected and retried updates are echoed exactly once
+        assert processed == echoed
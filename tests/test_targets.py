@@ -0,0 +1,29 @@
+"""weighted_shares splits a budget by weight with largest remainder rounding"""
+
+import pytest
+from services.scheduler.targets import weighted_shares
+
+
+@pytest.mark.parametrize(
+    ("total", "weights", "expected"),
+    [
+        (10, [1, 1], [5, 5]),
+        (10, [1, 1, 1], [4, 3, 3]),
+        (10, [3, 1], [8, 2]),
+        (100, [0.5, 0.25, 0.25], [50, 25, 25]),
+        (1, [1, 2], [0, 1]),
+        (0, [1, 2], [0, 0]),
+        (7, [1, 0], [7, 0]),
+    ],
+)
+def test_weighted_shares(total: int, weights: list[float], expected: list[int]) -> None:
+    assert weighted_shares(total, weights) == expected
+
+
+@pytest.mark.parametrize("total", [0, 1, 13, 99, 1000])
+def test_shares_sum_up_to_total(total: int) -> None:
+    weights = [0.7, 1.3, 2.9, 0.1]
+    shares = weighted_shares(total, weights)
+    assert sum(shares) == total
+    for share, weight in zip(shares, weights, strict=True):
+        assert abs(share - total * weight / sum(weights)) < 1